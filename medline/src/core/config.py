@@ -1,5 +1,6 @@
 import os
 import secrets
+from functools import lru_cache
 from pathlib import Path
 
 from pydantic import Field
@@ -14,9 +15,22 @@ class Settings(BaseSettings):
     PROJECT_SUMMARY: str = "The Unified product aggregator for everything Healthcare - from the best expositions, to catalogues and what's new"
     DATABASE_URL: str = Field(default="sqlite:///medline_dev.db")
 
+    # connection pool sizing, ignored for sqlite
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 30
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
     model_config = SettingsConfigDict(
         env_file=str(ENV_FILE_PATH), env_file_encoding="utf-8"
     )
 
 
-settings = Settings()  # type: ignore
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    # parses the .env file once per process, every caller shares the same instance
+    return Settings()  # type: ignore
+
+
+settings = get_settings()
@@ -1,12 +1,60 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
+                                    create_async_engine)
+from sqlalchemy.pool import StaticPool
 
-from core.config import settings as app_settings
+from src.core.config import Settings, get_settings
 
-engine = create_engine(app_settings.DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+# DATABASE_URL stays a plain sync url so alembic can keep using it as-is,
+# the app swaps in the matching async driver
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
 
 
-def get_db():
-    with SessionLocal() as db:
+def _async_url(database_url: str) -> URL:
+    url = make_url(database_url)
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+    return url.set(drivername=driver) if driver else url
+
+
+def _is_memory_sqlite(url: URL) -> bool:
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+
+def _engine_options(settings: Settings) -> dict:
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "sqlite":
+        # an in-memory database only lives as long as its connection, so every
+        # session has to share that one. A file-backed database keeps the default
+        # pool, a connection per session, so one session's commit or rollback
+        # never lands on another's unfinished work
+        if _is_memory_sqlite(url):
+            return {
+                "poolclass": StaticPool,
+                "connect_args": {"check_same_thread": False},
+            }
+        return {}
+
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+engine = create_async_engine(
+    _async_url(get_settings().DATABASE_URL),
+    echo=True,
+    **_engine_options(get_settings()),
+)
+SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+
+async def get_db():
+    async with SessionLocal() as db:
         yield db
+
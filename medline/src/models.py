@@ -1,6 +1,7 @@
 from typing import Optional
 
-from sqlalchemy import String
+from sqlalchemy import (Boolean, DateTime, ForeignKey, Index, Integer, String,
+                        Text, UniqueConstraint, func)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.schema import Column
 
@@ -10,10 +11,45 @@ Base = declarative_base()
 class Product(Base):
     __tablename__ = "products"
 
+    id = Column(Integer, primary_key=True)
+    # the product page we scraped it from, this is what we deduplicate on
+    source_url = Column(String(512), nullable=False)
+    merchant_id = Column(Integer, ForeignKey("merchants.id"), nullable=True)
+    title = Column(String(512), nullable=False)
+    model = Column(String(255), nullable=True)
+    description = Column(Text, nullable=True)
+    price = Column(String(64), nullable=True)
+    currency = Column(String(8), nullable=True)
+    video_url = Column(String(512), nullable=True)
+    catalog_available = Column(Boolean, nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("source_url", name="uq_product_source_url"),
+        Index("ix_product_merchant_id", "merchant_id"),
+    )
+
 
 class Merchant(Base):
     __tablename__ = "merchants"
 
+    id = Column(Integer, primary_key=True)
+    name = Column(String(255), nullable=False)
+    location_id = Column(Integer, ForeignKey("location.id"), nullable=True)
+    rating = Column(Integer, nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("name", name="uq_merchant_name"),
+        Index("ix_merchant_location_id", "location_id"),
+    )
+
 
 class Location(Base):
     __tablename__ = "location"
+
+    id = Column(Integer, primary_key=True)
+    # as displayed on the supplier card, e.g "Germany"
+    label = Column(String(255), nullable=False)
+
+    __table_args__ = (UniqueConstraint("label", name="uq_location_label"),)
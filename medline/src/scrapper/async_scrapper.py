@@ -1,23 +1,26 @@
 import asyncio
+import csv
 import logging
 import os
 import random
 import time
-from contextlib import asynccontextmanager
+from contextlib import ExitStack, asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Annotated, Any, Callable, Dict, List, Optional
+from typing import (IO, Annotated, Any, AsyncIterator, Callable, Dict, List,
+                    Optional)
 
-from bs4 import BeautifulSoup
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
-from playwright.async_api import Browser, BrowserContext
+from playwright.async_api import Browser
 from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import Locator, Page
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
 from playwright_stealth import stealth_async
+from selectolax.lexbor import LexborHTMLParser
 
+from src.scrapper.scrape_cache import SCRAPE_CACHE, canonical_url, get_or_fetch
 from src.scrapper.scrape_product_data_async import extract_product_data_async
 from src.scrapper.scrape_product_tiles_async import \
     scrape_product_overview_tiles
@@ -29,14 +32,18 @@ from .constants import (SELECTOR_CATEGORY_ITEM, SELECTOR_CATEGORY_LABEL,
                         SELECTOR_INDEX_ENTRY_LINK, SELECTOR_INDEX_ENTRY_TITLE,
                         SELECTOR_INDEX_LIST_CONTAINER,
                         SELECTOR_INDEX_PAGE_HEADER,
+                        SELECTOR_PRODUCT_TITLE_BLOCK,
                         SELECTOR_PRODUCTS_INNERMOST_CONTAINER,
                         SELECTOR_SUBCATEGORY_LINK,
                         SELECTOR_SUBCATEGORY_LINK_SAFE)
 from .constants import _ResponseData as Response
-from .utils import (browser_context, extract_product_link_from_tile,
-                    fallback_locator, get_random_user_agent, goto_with_retry,
-                    human_delay, is_valid_product_page, retry_with_backoff,
-                    write_category_to_excel)
+from .utils import (BROWSER_POOL, PRODUCT_EXPORT_HEADERS, ContextRecycler,
+                    ExcelSink, block_heavy_resources, block_trackers,
+                    goto_checked, normalize_whitespace, retry_with_backoff,
+                    save_storage_state, write_categories_to_json,
+                    write_jsonl_record, write_overview_sheet,
+                    write_product_entry_sheet, write_products_to_csv,
+                    write_subcategory_sheet)
 
 logger = logging.getLogger(__name__)
 
@@ -47,61 +54,166 @@ async def scrape_url(
     url: str,
     headless: bool = False,
     debug: bool = False,
-    slow_mo: int = 40,
-    wait_for_load: int = 3000,
+    slow_mo: int = 0,
+    wait_for_load: int = 15000,
     to_excel: bool = False,
+    to_json: bool = False,
+    to_csv: bool = False,
     output_dir: Path | None = None,
     send_notification: bool = False,
+    block_assets: bool = True,
 ) -> None:
     try:
-        async with browser_context(
-            headless=headless,
-            user_agent=get_random_user_agent(),
-            bypass_csp=True,
-        ) as ctx:
-            page = await ctx.new_page()
+        # browsers are launched once and kept warm across calls, each job only
+        # pays for a fresh context
+        await BROWSER_POOL.start(headless=headless, slow_mo=slow_mo, lean=not debug)
+        async with BROWSER_POOL.context(bypass_csp=True) as ctx:
+            if block_assets:
+                await ctx.route("**/*", block_heavy_resources)
 
+            page = await ctx.new_page()
             await stealth_async(page)
+            if block_assets:
+                await block_trackers(page)
 
-            await retry_with_backoff(lambda: page.goto(url, wait_until="networkidle"))
-            if debug and wait_for_load > 0:
-                await page.wait_for_timeout(wait_for_load)
+            # only the category menu is needed, so return as soon as the response
+            # starts and wait for that instead of the whole document
+            await retry_with_backoff(
+                lambda: goto_checked(page, url, wait_until="commit")
+            )
 
-            print("Checking for page response")
+            logger.debug("Checking for page response")
+
+            try:
+                await page.wait_for_selector(
+                    SELECTOR_HOMEPAGE_PRODUCTS_COLUMN,
+                    state="visible",
+                    timeout=wait_for_load or 15000,
+                )
+                parent_container_visble = True
+            except PlaywrightTimeoutError:
+                logger.warning("Category menu never showed up on %s", url)
+                parent_container_visble = False
 
-            parent_container_visble = await page.is_visible(
-                SELECTOR_HOMEPAGE_PRODUCTS_COLUMN
-            )
             if parent_container_visble:
-                print("[INFO] Parent Container is Visible")
-                await entrypoint(page, to_excel=to_excel)
+                logger.info("Parent container is visible")
+                await entrypoint(
+                    page,
+                    to_excel=to_excel,
+                    to_json=to_json,
+                    to_csv=to_csv,
+                    block_assets=block_assets,
+                )
+
+                # later runs start from these cookies instead of a blank profile
+                await save_storage_state(ctx)
 
     except (PlaywrightError, TimeoutError) as play_err:
-        logger.exception(f"Error scraping URL: {play_err}")
+        logger.exception("Error scraping URL %s: %s", url, play_err)
 
 
-async def scrape_all_subcategory_indexes(ctx: BrowserContext, categories):
-    sem = asyncio.Semaphore(8)
-    jobs = []
+async def scrape_urls(urls: List[str], concurrency: int = 8, **kwargs) -> None:
+    """
+    Scrapes several seed urls concurrently, at most `concurrency` at a time.
+    Every job gets its context from the shared pool, so no browser is launched per url
+    """
+    sem = asyncio.Semaphore(concurrency)
 
+    async def scrape_one(target_url: str) -> None:
+        async with sem:
+            await scrape_url(target_url, **kwargs)
+
+    await asyncio.gather(*(scrape_one(u) for u in urls))
+
+
+async def scrape_all_subcategory_indexes(
+    recycler: ContextRecycler,
+    categories,
+    pool_size: int = 8,
+    jsonl_out: Optional[IO[bytes]] = None,
+    ready: Optional[asyncio.Queue] = None,
+):
+    # `pool_size` workers pull subcategories off a queue, which also bounds how
+    # many requests hit the site at once. A worker that needs a browser page keeps
+    # it across jobs (the next goto resets it). When `jsonl_out` is given, every
+    # subcategory is written out as soon as it is done so a crash doesn't lose the
+    # whole index phase. When `ready` is given, every finished (section, sub) is
+    # put on it for the product phase to start on
+    queue: asyncio.Queue[tuple[str, Response]] = asyncio.Queue()
     for section in categories:
         for sub in section["subcategories"]:
+            queue.put_nowait((section["section"], sub))
+
+    async def worker():
+        page: Optional[Page] = None
+
+        async def fetch_index_entries(sub) -> Optional[list]:
+            nonlocal page
+
+            # subcategory pages are server rendered, a plain GET is usually enough
+            # and only falls back to a browser page when the html doesn't carry
+            # the index
+            index_entries = await fetch_listing_index_html(
+                recycler, sub["name"], sub["url"]
+            )
+            if index_entries is not None:
+                return index_entries
 
-            async def scrape_subcategory(name=sub["name"], url=sub["url"], storage=sub):
-                async with sem:
-                    page = await ctx.new_page()
-                    try:
-                        await scrape_product_listing_index(
-                            page, name, url, storage_=storage
-                        )
-                    except Exception as e:
-                        print(f"[ERROR] Failed scraping {name}: {e}")
-                    finally:
-                        await page.close()
+            page = await (recycler.reuse(page) if page else recycler.page())
 
-            jobs.append(scrape_subcategory())
+            result: Response = {}
+            await scrape_product_listing_index(
+                page, sub["name"], sub["url"], storage_=result
+            )
+            return result.get("index_entries")
 
-    await asyncio.gather(*jobs)
+        try:
+            while not queue.empty():
+                section_name, sub = queue.get_nowait()
+                try:
+                    index_entries = await get_or_fetch(
+                        sub["url"], lambda: fetch_index_entries(sub)
+                    )
+                    if index_entries is not None:
+                        sub["index_entries"] = index_entries
+                    if jsonl_out is not None:
+                        write_jsonl_record(jsonl_out, sub)
+                    if ready is not None:
+                        ready.put_nowait((section_name, sub))
+                except Exception as e:
+                    logger.error("Failed scraping %s: %s", sub["name"], e)
+        finally:
+            if page is not None:
+                await recycler.close_page(page)
+
+    await asyncio.gather(*(worker() for _ in range(pool_size)))
+
+
+_INDEX_ENTRY_SELECTORS = {
+    "link": SELECTOR_INDEX_ENTRY_LINK,
+    "image": "div.imgSubCat img",
+}
+
+_INDEX_LIST_SELECTOR = "div#category-group ul.category-grouplist"
+_INDEX_ITEM_SELECTOR = f"{_INDEX_LIST_SELECTOR} li"
+
+_INDEX_ENTRIES_JS = """
+(items, { link, image }) => items.flatMap((item) => {
+    const a = item.querySelector(link);
+    // an anchor without an href leads nowhere, it is not an entry
+    const href = a?.getAttribute("href");
+    if (!href) return [];
+    const img = item.querySelector(image);
+    return [{
+        title: a.innerText.trim(),
+        href,
+        image_meta: {
+            src: img?.getAttribute("src") || "",
+            alt: img?.getAttribute("alt") || "",
+        },
+    }];
+})
+"""
 
 
 async def scrape_product_listing_index(
@@ -110,255 +222,453 @@ async def scrape_product_listing_index(
     subcategory_url: str,
     storage_: Optional[Response] = None,
 ) -> None:
-    print(f"[INFO] Navigating to subcategory page: {subcategory_url}")
-    await retry_with_backoff(lambda: page.goto(subcategory_url))
-    await page.wait_for_selector(SELECTOR_INDEX_PAGE_HEADER)
-
-    page_heading = await (
-        await page.query_selector(SELECTOR_INDEX_PAGE_HEADER)
-    ).inner_text()
-    if page_heading.lower() != subcategory_name.lower():
-        print(
-            f"[WARN] Page mismatch: Expected '{subcategory_name}', got '{page_heading}'"
+    logger.debug("Navigating to subcategory page: %s", subcategory_url)
+    # the header/list waits below are what we actually need from the page
+    await retry_with_backoff(
+        lambda: goto_checked(page, subcategory_url, wait_until="commit")
+    )
+
+    # the locator waits for the header itself, no separate wait_for_selector needed
+    page_heading = await page.locator(SELECTOR_INDEX_PAGE_HEADER).first.inner_text()
+    if (
+        normalize_whitespace(page_heading).casefold()
+        != normalize_whitespace(subcategory_name).casefold()
+    ):
+        logger.warning(
+            "Page mismatch: expected '%s', got '%s'", subcategory_name, page_heading
         )
         return
 
-    # Wait for parent container
-    await page.wait_for_selector("div#category-group ul.category-grouplist")
-    group_nodes = await page.query_selector_all(
-        "div#category-group ul.category-grouplist"
-    )
-
-    index_entries = []
+    # Wait for parent container, then for the document to finish parsing so the
+    # list isn't read while its tail is still streaming in
+    await page.wait_for_selector(_INDEX_LIST_SELECTOR)
+    await page.wait_for_load_state("domcontentloaded")
 
-    for group in group_nodes:
-        item_nodes = await group.query_selector_all("li")
-        for item in item_nodes:
-            a_tag = await item.query_selector("a")
-            img_tag = await item.query_selector("div.imgSubCat img")
-
-            if not a_tag:
-                continue
-
-            name = (await a_tag.inner_text()).strip()
-            href = await a_tag.get_attribute("href")
-            img_src = await img_tag.get_attribute("src") if img_tag else ""
-            img_alt = await img_tag.get_attribute("alt") if img_tag else ""
-
-            index_entries.append(
-                {
-                    "title": name,
-                    "href": href,
-                    "image_meta": {
-                        "src": img_src,
-                        "alt": img_alt,
-                    },
-                }
-            )
+    # every entry is read in the page and comes back in a single round-trip
+    index_entries = await page.locator(_INDEX_ITEM_SELECTOR).evaluate_all(
+        _INDEX_ENTRIES_JS, _INDEX_ENTRY_SELECTORS
+    )
 
-    print(index_entries)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Index entries for '%s': %r", subcategory_name, index_entries)
 
     if storage_ is not None:
         storage_["index_entries"] = index_entries
 
-    print(
-        f"[INFO] Extracted {len(index_entries)} index entries from '{subcategory_name}'"
+    logger.debug(
+        "Extracted %d index entries from '%s'", len(index_entries), subcategory_name
     )
 
 
-async def extract_categories(
-    page: Page, logger_func: Optional[Callable[[str], None]] = None
-):
-    logger_func = logger_func or print
-
-    logger_func("[*] Looking for top-level category items...")
-    section_items = await fallback_locator(
-        page,
-        [
-            "li[data-cy^='universGroupItemCy_']",
-            SELECTOR_CATEGORY_ITEM,
-        ],
-    )
-    section_items = await section_items.all()
+def _parse_index_entries(html: str, subcategory_name: str) -> Optional[list]:
+    """
+    Same entries as `_INDEX_ENTRIES_JS`, read from raw html with selectolax.
+    Returns None when the html isn't the expected index page
+    """
+    tree = LexborHTMLParser(html)
+    heading = tree.css_first(SELECTOR_INDEX_PAGE_HEADER)
+    items = tree.css(_INDEX_ITEM_SELECTOR)
+    if heading is None or not items:
+        return None
 
-    logger_func(f"[+] Found {len(section_items)} top-level category items")
+    if (
+        normalize_whitespace(heading.text()).casefold()
+        != normalize_whitespace(subcategory_name).casefold()
+    ):
+        return None
 
-    categories: List[Dict[str, Any]] = []
+    index_entries = []
+    for item in items:
+        a = item.css_first(_INDEX_ENTRY_SELECTORS["link"])
+        href = a.attributes.get("href") if a is not None else None
+        if not href:
+            continue
+        img = item.css_first(_INDEX_ENTRY_SELECTORS["image"])
+        img_attrs = img.attributes if img is not None else {}
+        index_entries.append(
+            {
+                "title": normalize_whitespace(a.text()),
+                "href": href,
+                "image_meta": {
+                    "src": img_attrs.get("src") or "",
+                    "alt": img_attrs.get("alt") or "",
+                },
+            }
+        )
+    return index_entries
 
-    for i, section in enumerate(section_items):
-        logger_func(f"\n[→] Processing category index {i}")
 
-        try:
-            label_node = await fallback_locator(
-                page,
-                scope=section,
-                selectors=[
-                    ":scope span[class*='UniverseGroupLabel']",
-                    ":scope span[class*='universeGroup__UniverseGroupLabel']",
-                    ":scope span",
-                ],
-            )
-            print(f"[INFO] {label_node}")
-            category_name = (await label_node.inner_text()).strip()
-            logger_func(f"    [✓] Category name: '{category_name}'")
-        except Exception as e:
-            logger_func(f"    [!] Failed to extract category name: {e}")
-            continue
+async def fetch_listing_index_html(
+    recycler: ContextRecycler, subcategory_name: str, subcategory_url: str
+) -> Optional[list]:
+    """
+    Reads a subcategory's index entries with a plain HTTP request over the crawl's
+    context (same cookies), no page involved. None means the caller should fall
+    back to `scrape_product_listing_index`
+    """
+    try:
+        request = await recycler.request_context()
+        response = await request.get(subcategory_url, timeout=30000)
+        if not response.ok:
+            return None
+        html = await response.text()
+    except PlaywrightError as e:
+        logger.debug("Plain fetch failed for %s: %s", subcategory_url, e)
+        return None
+
+    index_entries = _parse_index_entries(html, subcategory_name)
+    if index_entries is not None:
+        logger.debug(
+            "Extracted %d index entries from '%s'", len(index_entries), subcategory_name
+        )
+    return index_entries
+
+
+# walks every top-level category in the browser and returns the whole tree in a
+# single round-trip. The dropdowns only render their links once expanded, so every
+# section is clicked first and all of them are read afterwards, in one pass each.
+# Interleaving a click and a read per section would force a layout every time.
+_EXTRACT_CATEGORIES_JS = """
+async ({ items, labels, timeout }) => {
+    // the selectors are fallbacks in priority order, the first one that matches
+    // wins; a single union would take whichever match comes first in the DOM
+    const firstMatch = (root, selectors) => {
+        for (const selector of selectors) {
+            const node = root.querySelector(selector);
+            if (node) return node;
+        }
+        return null;
+    };
+    const itemSelector = items.find((selector) => document.querySelector(selector));
+    const sections = itemSelector
+        ? Array.from(document.querySelectorAll(itemSelector))
+        : [];
+
+    sections.forEach((sec) => sec.click());
+    // read as soon as every expanded dropdown has rendered its links, re-checked
+    // on each DOM change; past `timeout` whatever has rendered is read as is
+    const expanded = () => sections.every((sec) => sec.querySelector("ul li a"));
+    if (!expanded()) {
+        await new Promise((resolve) => {
+            const done = () => {
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve();
+            };
+            const observer = new MutationObserver(() => expanded() && done());
+            const timer = setTimeout(done, timeout);
+            observer.observe(document.body, { childList: true, subtree: true });
+        });
+    }
+
+    return sections.map((sec) => {
+        const labelNode = firstMatch(sec, labels);
+        return {
+            section: (labelNode?.innerText || "").trim(),
+            subcategories: Array.from(sec.querySelectorAll("ul li a"))
+                .map((a) => ({ name: a.innerText.trim(), url: a.getAttribute("href") }))
+                .filter((sub) => sub.name && sub.url),
+        };
+    });
+}
+"""
+
+
+_CATEGORY_ITEM_SELECTORS = (
+    "li[data-cy^='universGroupItemCy_']",
+    SELECTOR_CATEGORY_ITEM,
+)
+_LABEL_SELECTORS = (
+    ":scope span[class*='UniverseGroupLabel']",
+    ":scope span[class*='universeGroup__UniverseGroupLabel']",
+    ":scope span",
+)
+
+# both lists are tried in order inside the page, so the fallbacks cost no extra
+# round-trips
+_CATEGORY_SELECTORS = {
+    "items": list(_CATEGORY_ITEM_SELECTORS),
+    "labels": list(_LABEL_SELECTORS),
+}
+
+# how long the expanded dropdowns get to render their links, in ms
+CATEGORY_EXPAND_TIMEOUT = 5000
 
-        # expand dropdown
-        try:
-            # wait 5 secs
-            await section.wait_for(timeout=5000)
-            await section.click(timeout=2000)
-            await human_delay(0.2)
-            logger_func("    [✓] Clicked to expand dropdown")
-        except Exception as e:
-            logger_func(f"    [!] Failed to expand category '{category_name}': {e}")
 
-        subsections = await section.locator("ul li a").all()
-        logger_func(f"[→] Section: {category_name} ({len(subsections)} subcategories)")
+async def extract_categories(
+    page: Page, logger_func: Optional[Callable[[str], None]] = None
+):
+    logger_func = logger_func or logger.info
 
-        subcategories = []
-        for subsection in subsections:
-            try:
-                name = (await subsection.inner_text()).strip()
-                href = await subsection.get_attribute("href")
-                if name and href:
-                    subcategories.append({"name": name, "url": href})
-                    logger_func(f"    [✓] Subsection: {name}")
-            except Exception as e:
-                logger_func(f"    [!] Failed to extract subsection link: {e}")
+    logger_func("Extracting top-level category items...")
+    tree: List[Dict[str, Any]] = await page.evaluate(
+        _EXTRACT_CATEGORIES_JS,
+        {**_CATEGORY_SELECTORS, "timeout": CATEGORY_EXPAND_TIMEOUT},
+    )
 
-        categories.append(
-            {
-                "section": category_name,
-                "subcategories": subcategories,
-            }
-        )
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    categories: List[Dict[str, Any]] = []
+    for category in tree:
+        if not category["section"]:
+            logger_func("Failed to extract category name, skipping")
+            continue
 
-        logger_func(
-            f"[→] Completed Section: {category_name} ({len(subsections)} subcategories)"
-        )
+        categories.append(category)
+        if debug_enabled:
+            logger.debug(
+                "[→] Section: %s (%d subcategories)",
+                category["section"],
+                len(category["subcategories"]),
+            )
 
-    logger_func("\n[✓] Completed extracting all categories.")
+    logger_func("Completed extracting all categories.")
     return categories
 
 
 async def extract_categories_from_homepage(
     page: Page, storage_: Optional[Response] = None
 ):
-    print("[INFO] Entered inside the function: extract_categories_from_homepage")
+    logger.debug("Entered inside the function: extract_categories_from_homepage")
 
     try:
         await page.wait_for_selector(
             SELECTOR_PRODUCTS_INNERMOST_CONTAINER, state="attached", timeout=15000
         )
-        print("[INFO] Selector attached to DOM")
+        logger.debug("Selector attached to DOM")
         container = page.locator(SELECTOR_PRODUCTS_INNERMOST_CONTAINER)
         is_visible = await container.is_visible()
 
-        print(f"[INFO] Container visibility: {is_visible}")
+        logger.debug("Container visibility: %s", is_visible)
 
         if not is_visible:
-            print("[INFO] Element is attached but not visible")
+            logger.info("Element is attached but not visible")
             return
 
-        print("[INFO] Element is attached AND visible. Proceeding.")
+        logger.debug("Element is attached AND visible. Proceeding.")
     except (PlaywrightTimeoutError, Exception):
-        print("[ERROR] Innermost container never appeared in DOM")
+        logger.error("Innermost container never appeared in DOM")
         return
 
     try:
         categories = await extract_categories(page)
     except Exception as e:
-        print(f"[ERROR] Failed to extract categories: {e}")
+        logger.error("Failed to extract categories: %s", e)
         return
 
     if storage_:
         storage_["categories"] = categories
 
-    print(f"[INFO] Extracted {len(categories)} top-level sections.")
+    logger.info("Extracted %d top-level sections.", len(categories))
     return categories
 
 
+# caps the number of product detail fetches in flight, across all index entries
+DETAIL_SEM = asyncio.Semaphore(32)
+
+
+# a product that is gone for good, as opposed to a refused HEAD (405), a rate
+# limit (403/429) or a server blip (5xx), none of which say anything about the page
+_DEAD_PRODUCT_STATUSES = frozenset({404, 410})
+
+
+async def _is_live_product_url(recycler: ContextRecycler, product_url: str) -> bool:
+    """
+    Cheap HEAD check, over the crawl's own cookies, before paying for a page.
+    Some product links redirect away (moved or removed products), which breaks
+    `extract_product_data_async`, so those are skipped along with 404/410. Any
+    other answer is left to the page visit, which has its own retries
+    """
+    try:
+        request = await recycler.request_context()
+        response = await request.head(product_url, max_redirects=0, timeout=15000)
+    except PlaywrightError:
+        # the check is only an optimization, let the page visit decide
+        return True
+
+    status = response.status
+    return not (300 <= status < 400 or status in _DEAD_PRODUCT_STATUSES)
+
+
+async def fetch_product_detail(
+    recycler: ContextRecycler, product_url: str
+) -> Optional[dict]:
+    """
+    Visits a product link on its own page and returns the full product data
+    """
+    async with DETAIL_SEM:
+        if not await _is_live_product_url(recycler, product_url):
+            logger.info("Product link redirects or is gone, skipping: %s", product_url)
+            return None
+
+        page = await recycler.page()
+        try:
+            logger.debug("Visiting product link: %s", product_url)
+            # the extractor reads the whole page in one evaluate, so the document
+            # has to be parsed in full (description, specs, images and price come
+            # after the title); the title block is then waited on in case it is
+            # rendered client side
+            await retry_with_backoff(
+                lambda: goto_checked(
+                    page, product_url, timeout=60000, wait_until="domcontentloaded"
+                )
+            )
+            try:
+                await page.wait_for_selector(
+                    SELECTOR_PRODUCT_TITLE_BLOCK, state="attached", timeout=15000
+                )
+            except PlaywrightTimeoutError:
+                # the extractor copes with a missing title block on its own
+                logger.debug("No title block on %s", product_url)
+
+            return await extract_product_data_async(page)
+        except Exception as e:
+            logger.warning("Failed to extract full product at %s: %s", product_url, e)
+            return None
+        finally:
+            await recycler.close_page(page)
+
+
+async def _iter_subcategories(
+    categories: List[Dict[str, Any]],
+) -> AsyncIterator[tuple[str, Dict[str, Any]]]:
+    for section in categories:
+        for sub in section.get("subcategories", []):
+            yield section["section"], sub
+
+
+async def _drain_queue(queue: asyncio.Queue) -> AsyncIterator[Any]:
+    """Yields items off `queue` until a `None` sentinel"""
+    while (item := await queue.get()) is not None:
+        yield item
+
+
 async def scrape_product_overview(
-    ctx: BrowserContext,
+    recycler: ContextRecycler,
     categories: List[Dict[str, Any]],
     logger_func: Optional[Callable] = None,
+    csv_out: Optional[IO[str]] = None,
+    excel_out: Optional[ExcelSink] = None,
+    subcategories: Optional[AsyncIterator[tuple[str, Dict[str, Any]]]] = None,
+    workers: int = 5,
 ):
-    logger_func = logger_func or print
-
-    sem = asyncio.Semaphore(5)
+    # `workers` tasks pull listing urls off a small bounded queue that a producer
+    # fills lazily from the category tree, so only a handful of jobs exist at a
+    # time. When `csv_out`/`excel_out` are given, every entry's products are
+    # written to them as soon as the entry is done, instead of building the whole
+    # export at the end. `subcategories` lets the caller feed (section, sub) pairs
+    # as the index phase finishes them, by default the whole tree is walked
+    logger_func = logger_func or logger.info
+    if subcategories is None:
+        subcategories = _iter_subcategories(categories)
+
+    # the same listing is often cross-listed under several subcategories, every
+    # url is scraped once and its products handed to all the entries pointing at it
+    queue: asyncio.Queue[Optional[str]] = asyncio.Queue(maxsize=workers)
+    pending: Dict[str, List[tuple]] = {}
+    finished: Dict[str, Optional[list]] = {}
+    # products show up under several listings too, each one is visited once
+    details: Dict[str, asyncio.Future] = {}
+
+    def assign_products(job: tuple, products: list) -> None:
+        section, subcategory, entry = job
+        entry["products"] = products
+        if csv_out is not None:
+            write_products_to_csv(csv_out, section, subcategory, entry)
+        if excel_out is not None:
+            excel_out.submit(write_product_entry_sheet, section, subcategory, entry)
+
+    async def produce():
+        async for section, sub in subcategories:
+            for entry in sub.get("index_entries", []):
+                # an anchor without an href has no listing to visit, and index
+                # entries cached by an older run may still carry one
+                if not entry.get("href"):
+                    continue
+                job = (section, sub["name"], entry)
+                key = canonical_url(entry["href"])
+                if key in finished:
+                    if finished[key] is not None:
+                        assign_products(job, finished[key])
+                elif key in pending:
+                    pending[key].append(job)
+                else:
+                    pending[key] = [job]
+                    await queue.put(key)
+
+        for _ in range(workers):
+            await queue.put(None)
+
+    async def product_detail(tile: dict) -> Optional[dict]:
+        key = canonical_url(tile["product_link"])
+        if key not in details:
+            details[key] = asyncio.ensure_future(
+                fetch_product_detail(recycler, tile["product_link"])
+            )
+        # shielded, another listing may be waiting on the same visit
+        detail = await asyncio.shield(details[key])
+        return {**tile, **detail} if detail else None
 
-    entries_to_scrape = [
-        entry
-        for section in categories
-        for sub in section.get("subcategories", [])
-        for entry in sub.get("index_entries", [])
-    ]
+    async def fetch_products(entry) -> list:
+        page = await recycler.page()
+        try:
+            logger.debug("Visiting product tile index page: %s", entry.get("href"))
+            # the tile extraction waits for the tiles themselves
+            await page.goto(entry["href"], timeout=60000, wait_until="commit")
+
+            # operation 3: scrape all product tiles in this entry
+            tile_data = await scrape_product_overview_tiles(page, recycler)
+
+            # operation 4: visit every product tile link in parallel and extract full product data
+            details = await asyncio.gather(
+                *(
+                    product_detail(tile)
+                    for tile in tile_data
+                    if tile.get("product_link")
+                )
+            )
+            return [detail for detail in details if detail]
+        finally:
+            await recycler.close_page(page)
 
-    async def scrape_entry(entry):
-        async with sem:
-            page = await ctx.new_page()
+    async def worker():
+        while (key := await queue.get()) is not None:
+            entry = pending[key][0][2]
             try:
-                print(f"[->] Visiting product tile index page: {entry.get('href')}")
-                await page.goto(
-                    entry["href"], timeout=60000, wait_until="domcontentloaded"
+                products = await get_or_fetch(
+                    entry["href"], lambda: fetch_products(entry)
+                )
+                logger.debug(
+                    "Completed scraping for index entry: %s", entry.get("title")
                 )
-
-                # operation 3: scrape all product tiles in this entry
-                tile_data = await scrape_product_overview_tiles(page)
-
-                # operation 4: for each product tile link, visit and extract full product data
-                full_product_details = []
-                for tile in tile_data:
-                    product_url = tile.get("product_link")
-                    if not product_url:
-                        continue
-
-                    try:
-                        print(f"[->->] Visiting product link: {product_url}")
-                        await page.goto(
-                            product_url, timeout=60000, wait_until="domcontentloaded"
-                        )
-
-                        # I have just discovered some product link causes redirect breaking
-                        # our `extract_product_data_async` logic
-                        # if not await is_valid_product_page(
-                        #     page, logger_func=logger_func
-                        # ):
-                        #     logger_func(
-                        #         f"[WARN] Product page appears to be invalid, removed or moved permanently: {product_url}"
-                        #     )
-                        #     logger_func(
-                        #         f"[SKIP] Soft 404 or placeholder page: {product_url}"
-                        #     )
-                        #     continue
-
-                        full_data = await extract_product_data_async(page)
-                        full_product_details.append({**tile, **full_data})
-                    except Exception as e:
-                        print(
-                            f"[WARN] Failed to extract full product at {product_url}: {e}"
-                        )
-                        continue
-
-                entry["products"] = full_product_details
-                print(f"[✓] Completed scraping for index entry: {entry.get('title')}")
-
             except Exception as e:
-                print(
-                    f"[WARN] Could not scrape product detail for {entry.get('href')}: {e}"
+                logger.warning(
+                    "Could not scrape product detail for %s: %s", entry.get("href"), e
                 )
-            finally:
-                await page.close()
-
-    await asyncio.gather(*(scrape_entry(entry) for entry in entries_to_scrape))
-    print("[INFO] Completed all tile + full product detail extractions.")
+                products = None
 
+            finished[key] = products
+            for job in pending.pop(key):
+                if products is not None:
+                    assign_products(job, products)
 
-async def entrypoint(page: Page, to_excel=False) -> None:
-    print("[INFO] Attempting to perform scrapping...")
+    try:
+        await asyncio.gather(produce(), *(worker() for _ in range(workers)))
+    finally:
+        # detail visits are shielded from any single listing being cancelled, so
+        # once the overview itself is over (done, failed or cancelled) whatever is
+        # still running has nobody left waiting on it. They are stopped here,
+        # before the caller closes the recycler their pages come from
+        outstanding = [future for future in details.values() if not future.done()]
+        for future in outstanding:
+            future.cancel()
+        await asyncio.gather(*outstanding, return_exceptions=True)
+    logger_func("Completed all tile + full product detail extractions.")
+
+
+async def entrypoint(
+    page: Page, to_excel=False, to_json=False, to_csv=False, block_assets=True
+) -> None:
+    logger.info("Attempting to perform scrapping...")
     scraped_data: Response = {}
 
     # OPERATION 1
@@ -367,36 +677,124 @@ async def entrypoint(page: Page, to_excel=False) -> None:
     if categories:
         scraped_data["categories"] = categories
 
-    print("[INFO] Completed Extract")
+    logger.info("Completed Extract")
+
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+
+    # streamed outputs are opened up front and written to while the crawl runs
+    exports_dir = Path(__file__).resolve().parent / "exports"
+    with ExitStack() as outputs:
+        jsonl_out: Optional[IO[bytes]] = None
+        csv_out: Optional[IO[str]] = None
+        excel_out: Optional[ExcelSink] = None
+        if to_json or to_csv or to_excel:
+            exports_dir.mkdir(parents=True, exist_ok=True)
+        if to_json:
+            jsonl_out = outputs.enter_context(
+                open(
+                    exports_dir / f"scraped_expo_subcategories_{timestamp}.jsonl", "ab"
+                )
+            )
+        if to_csv:
+            csv_out = outputs.enter_context(
+                open(
+                    exports_dir / f"scraped_expo_products_{timestamp}.csv",
+                    "w",
+                    newline="",
+                    encoding="utf-8",
+                )
+            )
+            csv.writer(csv_out).writerow(PRODUCT_EXPORT_HEADERS)
+        if to_excel:
+            # the workbook is filled on its own thread while the crawl runs
+            excel_out = ExcelSink(exports_dir / f"scraped_expo_data_{timestamp}.xlsx")
+
+        # the crawl below navigates hundreds of pages, so it runs on contexts that are
+        # recycled every few dozen pages rather than on the homepage's own context
+        recycler = ContextRecycler(
+            page.context.browser, every=50, block_assets=block_assets, bypass_csp=True
+        )
+        # the product phase starts on each subcategory as soon as its index is in,
+        # instead of waiting for the whole index phase
+        ready: asyncio.Queue = asyncio.Queue()
 
-    # Operation 2
-    await scrape_all_subcategory_indexes(page.context, scraped_data["categories"])
+        async def index_phase():
+            try:
+                # Operation 2
+                await scrape_all_subcategory_indexes(
+                    recycler,
+                    scraped_data["categories"],
+                    jsonl_out=jsonl_out,
+                    ready=ready,
+                )
+            finally:
+                ready.put_nowait(None)
 
-    # OPERATION 3 + 4
-    await scrape_product_overview(page.context, scraped_data["categories"])
+        async def ready_subcategories():
+            async for section, sub in _drain_queue(ready):
+                if excel_out is not None:
+                    # its index entries are final, products only add keys to them
+                    excel_out.submit(write_subcategory_sheet, section, sub)
+                yield section, sub
 
-    # print(f"[INFO] {scraped_data}")
-    print("[INFO] Successfully scraped website")
+        if excel_out is not None:
+            excel_out.submit(write_overview_sheet, scraped_data["categories"])
 
-    if to_excel and "categories" in scraped_data:
-        print("[DEBUG] Writing extracted categories to Excel file...")
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        write_category_to_excel(
-            scraped_data["categories"], filename=f"scraped_expo_data_{timestamp}.xlsx"
+        index_task = asyncio.create_task(index_phase())
+        try:
+            # OPERATION 3 + 4
+            await scrape_product_overview(
+                recycler,
+                scraped_data["categories"],
+                csv_out=csv_out,
+                excel_out=excel_out,
+                subcategories=ready_subcategories(),
+            )
+            # the index phase is over once its sentinel was read, this re-raises
+            # whatever ended it
+            await index_task
+        finally:
+            if not index_task.done():
+                index_task.cancel()
+                await asyncio.gather(index_task, return_exceptions=True)
+            await recycler.close()
+            if excel_out is not None:
+                # saves whatever was scraped, the same way the CSV keeps its rows
+                await asyncio.to_thread(excel_out.close)
+
+    logger.info("Successfully scraped website")
+
+    # the JSON dump is synchronous and can take seconds on a full catalog, run it
+    # in a thread so the loop keeps serving whatever browser traffic is left
+    if to_json and "categories" in scraped_data:
+        logger.debug("Writing extracted categories to JSON file...")
+        await asyncio.to_thread(
+            write_categories_to_json,
+            scraped_data["categories"],
+            filename=f"scraped_expo_data_{timestamp}.json",
         )
 
 
 if __name__ == "__main__":
     import argparse
     import asyncio
+    import signal
 
     parser = argparse.ArgumentParser(description="MedicalExpo Product Scraper")
 
     parser.add_argument(
         "--url",
         type=str,
-        default="https://www.medicalexpo.com/",
-        help="Target URL to scrape from.",
+        nargs="+",
+        default=["https://www.medicalexpo.com/"],
+        help="Target URL(s) to scrape from.",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of URLs scraped at the same time (default: 8).",
     )
 
     parser.add_argument(
@@ -414,15 +812,15 @@ if __name__ == "__main__":
     parser.add_argument(
         "--slow-mo",
         type=int,
-        default=40,
-        help="Slow motion delay in ms between browser actions (default: 40).",
+        default=0,
+        help="Delay in ms between browser actions, for debugging (default: 0).",
     )
 
     parser.add_argument(
         "--wait-for-load",
         type=int,
-        default=3000,
-        help="Wait time in ms after initial page load (default: 3000).",
+        default=15000,
+        help="Max time in ms to wait for the category menu (default: 15000).",
     )
 
     parser.add_argument(
@@ -431,6 +829,18 @@ if __name__ == "__main__":
         help="Whether to write the result to Excel.",
     )
 
+    parser.add_argument(
+        "--to-json",
+        action="store_true",
+        help="Whether to write the result to JSON.",
+    )
+
+    parser.add_argument(
+        "--to-csv",
+        action="store_true",
+        help="Whether to stream scraped products to a CSV file while scraping.",
+    )
+
     parser.add_argument(
         "--output-dir",
         type=Path,
@@ -438,6 +848,19 @@ if __name__ == "__main__":
         help="Path to directory for saving output files.",
     )
 
+    parser.add_argument(
+        "--no-block-assets",
+        dest="block_assets",
+        action="store_false",
+        help="Let images, fonts, media and stylesheets load (blocked by default).",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore previously scraped results and fetch every page again.",
+    )
+
     parser.add_argument(
         "--notify",
         action="store_true",
@@ -446,4 +869,47 @@ if __name__ == "__main__":
 
     args = parser.parse_args()
 
-    asyncio.run(scrape_url(url, headless=args.headless, to_excel=args.to_excel))
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.INFO,
+        format="[%(levelname)s] %(message)s",
+    )
+
+    async def main() -> None:
+        SCRAPE_CACHE.enabled = not args.no_cache
+
+        # a SIGTERM (docker stop, systemd, ...) unwinds like Ctrl+C does, so the
+        # shared browsers are still closed by the `finally` below
+        try:
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGTERM, asyncio.current_task().cancel
+            )
+        except NotImplementedError:
+            pass  # no loop signal handlers on windows
+
+        try:
+            await scrape_urls(
+                args.url,
+                concurrency=args.concurrency,
+                headless=args.headless,
+                debug=args.debug,
+                slow_mo=args.slow_mo,
+                wait_for_load=args.wait_for_load,
+                to_excel=args.to_excel,
+                to_json=args.to_json,
+                to_csv=args.to_csv,
+                block_assets=args.block_assets,
+            )
+        finally:
+            await BROWSER_POOL.shutdown()
+            await SCRAPE_CACHE.close()
+
+    # uvloop schedules the many small playwright awaits noticeably faster than the
+    # stock loop, it isn't available on windows
+    try:
+        import uvloop
+
+        loop_factory = uvloop.new_event_loop
+    except ImportError:
+        loop_factory = None
+
+    asyncio.run(main(), loop_factory=loop_factory)
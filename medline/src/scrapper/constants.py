@@ -1,6 +1,6 @@
 from typing import Annotated
 
-USER_AGENTS = [
+USER_AGENTS = (
     "Mozilla/5.0 ... Chrome/128.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36",
@@ -16,12 +16,15 @@ USER_AGENTS = [
     "Mozilla/5.0 (iPhone; CPU iPhone OS 17_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1",
     "Mozilla/5.0 (Linux; Android 13; SAMSUNG SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) SamsungBrowser/21.0 Chrome/110.0.5481.154 Mobile Safari/537.36",
     "Mozilla/5.0 (iPad; CPU OS 17_7 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) CriOS/136.0.7103.91 Mobile/15E148 Safari/604.1",
-]
+)
 
 url: str = "https://www.medicalexpo.com/"
 
 _ResponseData = Annotated[dict, "Prettified JSON response"]
 
+# what a link to an actual product page looks like, anything else on a tile is noise
+PRODUCT_URL_PATTERN = r"^https://www\.medicalexpo\.com/prod/.+/product-\d+-\d+\.html$"
+
 # PAGE 2 =====================================
 SELECTOR_INDEX_PARENT_CONTAINER = 'div.hoverizeList:nth-child(1)'
 SELECTOR_INDEX_LIST_CONTAINER = "ul.category-grouplist"
@@ -31,6 +34,38 @@ SELECTOR_INDEX_ENTRY_TITLE = "p.subCatTitle"
 SELECTOR_INDEX_ENTRY_IMAGE = "div.imgSubCat > img"
 SELECTOR_INDEX_PAGE_HEADER = "h1#category"
 
+# PAGE 3 (product listing) ===================
+SELECTOR_PRODUCT_TILE = ".product-tile"
+SELECTOR_TILE_TITLE = "h3.short-name"
+SELECTOR_TILE_LINK_TITLE = "a[href] > h3.short-name"
+SELECTOR_TILE_LOGO_IMG = "a.logo img"
+SELECTOR_TILE_IMG = ".inset-img img"
+SELECTOR_TILE_MODEL = "div.model"
+SELECTOR_TILE_PRICE = "div.price span.js-price-content"
+SELECTOR_TILE_DESCRIPTION = "p.description-text"
+SELECTOR_TILE_VIDEO = ".icon-big video, .new-video"
+SELECTOR_TILE_FEATURES = "div.feature-values-container span"
+# the "see more" tile, linking to the next batch of products
+SELECTOR_TILE_SEE_MORE = "#nextButton span.short-name"
+# the "next" arrow only points at a page that is already listed
+SELECTOR_PAGINATION_LINKS = "div.pagination-wrapper a:not(.next)"
+
+# PAGE 4 (product detail) ====================
+# title/model block, the first thing the product extractor reads
+SELECTOR_PRODUCT_TITLE_BLOCK = 'span[class^="sc-2mcr2-0"]'
+SELECTOR_PRODUCT_TAGS = 'div[class^="sc-cw67gy-0"] span[class^="sc-cw67gy-1"]'
+SELECTOR_PRODUCT_DESCRIPTION = ".sc-3fi1by-0.hlEuXW"
+SELECTOR_PRODUCT_CHARACTERISTICS = "dl.sc-mgb5nu-0.gedvae"
+SELECTOR_PRODUCT_MANUFACTURER_NAME = 'div[class*="supplierDetails__Name"]'
+SELECTOR_PRODUCT_MANUFACTURER_LOCATION = 'div[class*="supplierDetails__Location"]'
+# one hidden star span per missing rating point
+XPATH_PRODUCT_MANUFACTURER_RATING = (
+    "//div[contains(@class, 'supplierDetails__RatingDetails-sc-cmi9pt-12 dVOoeb rating')]"
+    "//span[contains(@style, 'visibility: hidden')]"
+)
+SELECTOR_PRODUCT_IMAGES = 'div[class*="imageViewer__NavPicsWrapper"] img[data-src$=".jpg"]'
+SELECTOR_PRODUCT_PRICE = 'div[class*="mainSupplier__PriceValue"] span'
+
 # Page 1 (Homepage) ==========================
 SELECTOR_MENU_WRAPPER = "div.menuUniverse__Wrapper-sc-10tgqhe-0"
 
@@ -51,7 +86,19 @@ SELECTOR_CATEGORY_COLUMN = ".sc-6qd6g7-6"
 SELECTOR_HOMEPAGE_PRODUCTS_COLUMN = "div.sc-19e28ua-1.eZHbVe"
 
 # The parent row holding two columns
-# SELECTOR_CATEGORY_ROW = "div.row__Row-sc-wfit35-0.universGroup__MenuRow-sc-6qd6g7-6"
+SELECTOR_CATEGORY_ROW = (
+    "div.row__Row-sc-wfit35-0.universGroup__MenuRow-sc-6qd6g7-6.kVmZTr"
+)
+
+# Either of the two columns inside the row
+SELECTOR_PRODUCT_CATEGORY_COLUMN = (
+    "div.column__Column-sc-ztyvp1-0.universGroup__MenuColumn-sc-6qd6g7-7.eaYfnt"
+)
+
+# Each category section (<li>) inside a column, by its full class name
+SELECTOR_CATEGORY_SECTION_LIST = (
+    "li.universGroup__UniverseGroupItemComponent-sc-6qd6g7-3.dTahsv"
+)
 
 
 SELECTOR_CATEGORY_LABEL_SAFE = "span[class*='UniverseGroupLabel']"
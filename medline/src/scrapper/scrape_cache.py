@@ -0,0 +1,146 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import aiosqlite
+import orjson
+
+CACHE_PATH = Path(__file__).resolve().parent / "scrape_cache.sqlite3"
+
+# a day old result is still good enough, the catalog doesn't move faster than that
+DEFAULT_TTL = 24 * 60 * 60
+
+_TRACKING_PARAMS = ("utm_", "gclid", "fbclid", "mc_")
+
+
+def canonical_url(url: str) -> str:
+    """
+    Strips tracking query params and the fragment and sorts what is left of the
+    query, so one page maps to one key
+    """
+    parts = urlsplit(url)
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(_TRACKING_PARAMS)
+    )
+    return urlunsplit(
+        (parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), "")
+    )
+
+
+class ScrapeCache:
+    """
+    URL keyed memo of scraped results, kept in memory and in a sqlite file next
+    to this module.
+
+    Duplicate urls within a run (the same subcategory listed under two sections)
+    are fetched once, and re-runs within `ttl` seconds skip the network entirely.
+    Results are stored serialized, so every hit hands back its own copy. Empty
+    results are never stored: a listing whose tiles timed out or whose product
+    visits all failed comes back as `[]`, and that is worth retrying next run.
+    """
+
+    def __init__(
+        self, path: Path = CACHE_PATH, ttl: int = DEFAULT_TTL, enabled: bool = True
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.enabled = enabled
+        self._memory: Dict[str, tuple[float, bytes]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._db: Optional[aiosqlite.Connection] = None
+        self._lock = asyncio.Lock()
+
+    async def get_or_fetch(
+        self, url: str, fetcher: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Returns the cached result for `url`, or awaits `fetcher` and caches what it
+        returns. An empty result (`None`, `[]`, `{}`) or an exception is never
+        cached, only handed to the callers waiting on this fetch.
+        """
+        if not self.enabled:
+            return await fetcher()
+
+        key = canonical_url(url)
+        cached = await self._get(key)
+        if cached is not None:
+            return orjson.loads(cached)
+
+        # a concurrent job is already fetching this url, wait for its result
+        if key in self._inflight:
+            return orjson.loads(await asyncio.shield(self._inflight[key]))
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fetcher()
+            payload = orjson.dumps(result)
+            if result:
+                await self._set(key, payload)
+            future.set_result(payload)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # nobody else may be waiting, don't let the loop warn about it
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def close(self) -> None:
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    async def _connect(self) -> aiosqlite.Connection:
+        async with self._lock:
+            if self._db is None:
+                self._db = await aiosqlite.connect(self.path)
+                await self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS scrape_cache "
+                    "(url TEXT PRIMARY KEY, payload BLOB NOT NULL, fetched_at REAL NOT NULL)"
+                )
+                await self._db.commit()
+        return self._db
+
+    async def _get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        hit = self._memory.get(key)
+        if hit and now - hit[0] < self.ttl:
+            return hit[1]
+
+        db = await self._connect()
+        async with db.execute(
+            "SELECT payload, fetched_at FROM scrape_cache WHERE url = ?", (key,)
+        ) as cursor:
+            row = await cursor.fetchone()
+
+        if row is None or now - row[1] >= self.ttl:
+            return None
+        self._memory[key] = (row[1], row[0])
+        return row[0]
+
+    async def _set(self, key: str, payload: bytes) -> None:
+        fetched_at = time.time()
+        self._memory[key] = (fetched_at, payload)
+
+        db = await self._connect()
+        await db.execute(
+            "INSERT OR REPLACE INTO scrape_cache (url, payload, fetched_at) VALUES (?, ?, ?)",
+            (key, payload, fetched_at),
+        )
+        await db.commit()
+
+
+SCRAPE_CACHE = ScrapeCache()
+
+
+async def get_or_fetch(url: str, fetcher: Callable[[], Awaitable[Any]]) -> Any:
+    return await SCRAPE_CACHE.get_or_fetch(url, fetcher)
@@ -3,215 +3,148 @@ Allows us to extract the full product data of a given product
 """
 
 import asyncio
-from typing import Literal, Optional
+import logging
+from typing import Optional
 
-from playwright.async_api import Page, async_playwright
+from playwright.async_api import Page
 from playwright.sync_api import BrowserContext
 
-
-async def extract_product_data_async(page: Page) -> dict:
-    data = {}
-    # await page.wait_for_load_state("networkidle")
-
-    title, model = await _extract_product_title_and_model(page)
-    data["title"] = title
-    data["model"] = model
-
-    # 2. Tags / Attributes
-    data["tags"] = await _extract_product_attr_tags(page)
-
-    # 3. Description
-    data["description"] = await _extract_full_product_description(page)
-
-    # 4. Characteristics
-    data["characteristics"] = await _extract_characteristics_table(page)
-
-    # 5. Catalog
-    catalog_header = page.locator('h2:has-text("Catalogs")').first
-    data["catalog_available"] = None
-    if await catalog_header.count():
-        p = catalog_header.locator("xpath=following::p").first
-        if await p.count():
-            text = await p.inner_text()
-            data["catalog_available"] = "no catalogs" not in text.lower()
-
-    # 6. Video
-    data["video_url"] = await _extract_video_url(page)
-
-    # 7. Manufacturer Info
-    manu_name = page.locator('div[class*="supplierDetails__Name"]')
-    manu_location = page.locator('div[class*="supplierDetails__Location"]')
-    data["manufacturer"] = {
-        "name": (await manu_name.inner_text()).strip() if manu_name else None,
-        "location": (await manu_location.inner_text()).strip()
-        if manu_location
-        else None,
+from .constants import (
+    SELECTOR_PRODUCT_CHARACTERISTICS,
+    SELECTOR_PRODUCT_DESCRIPTION,
+    SELECTOR_PRODUCT_IMAGES,
+    SELECTOR_PRODUCT_MANUFACTURER_LOCATION,
+    SELECTOR_PRODUCT_MANUFACTURER_NAME,
+    SELECTOR_PRODUCT_PRICE,
+    SELECTOR_PRODUCT_TAGS,
+    SELECTOR_PRODUCT_TITLE_BLOCK,
+    XPATH_PRODUCT_MANUFACTURER_RATING,
+)
+from .utils import BROWSER_POOL
+
+logger = logging.getLogger(__name__)
+
+# reads the whole product page inside the browser, so a product costs one
+# round-trip instead of a couple dozen. Missing parts come back as null and get
+# their defaults in python
+_EXTRACT_PRODUCT_JS = """
+({ sel, ratingXpath }) => {
+    const text = (node) => (node ? node.innerText : null);
+    const trimmed = (node) => text(node)?.trim() || null;
+
+    // first node after the h2 whose text contains `label`, undefined without
+    // such a heading
+    const afterHeading = (label, xpath) => {
+        const heading = Array.from(document.querySelectorAll("h2")).find((h2) =>
+            h2.textContent.toLowerCase().includes(label.toLowerCase())
+        );
+        if (!heading) return undefined;
+        return document.evaluate(
+            xpath, heading, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+    };
+
+    const titleSpans = document.querySelector(sel.title_block)?.querySelectorAll("span");
+
+    const characteristics = {};
+    const table = document.querySelector(sel.characteristics);
+    if (table) {
+        const dds = table.querySelectorAll("dd");
+        table.querySelectorAll("dt").forEach((dt, i) => {
+            if (dds[i]) characteristics[dt.innerText.trim()] = dds[i].innerText.trim();
+        });
     }
-    # data["manufacturer"] = await _extract_manufacturer_info(page)
-
-    # 8. Rating
-    data["manufacturer"]["rating"] = await _extract_manufacturer_rating(page)
-
-    # 9. Images
-    data["images"] = await _extract_product_img_urls(page)
-
-    # 10. Product Price
-    price, currency = await _extract_product_price(page)
-    data["indicative_price"] = price
-    data["currency"] = currency
-
-    return data
-
-
-async def _extract_full_product_description(page: Page) -> str:
-    desc_element = page.locator(".sc-3fi1by-0.hlEuXW")
-    # await desc_element.wait_for(state="attached", timeout=60000)
-
-    description = await desc_element.inner_text()
-    return description or "No description available"
 
+    const catalog = afterHeading("Catalogs", "following::p");
+    const video = afterHeading("VIDEO", "following::video/source");
+
+    const images = Array.from(document.querySelectorAll(sel.images))
+        .map((img) => img.getAttribute("data-src"))
+        .filter(Boolean);
+
+    return {
+        title: text(titleSpans?.[0]),
+        model: text(titleSpans?.[1]),
+        tags: Array.from(document.querySelectorAll(sel.tags)).map(text),
+        description: text(document.querySelector(sel.description)),
+        characteristics,
+        catalog_available: catalog
+            ? !catalog.innerText.toLowerCase().includes("no catalogs")
+            : null,
+        video_url: video?.getAttribute("src") ?? null,
+        manufacturer: {
+            name: trimmed(document.querySelector(sel.manufacturer_name)),
+            location: trimmed(document.querySelector(sel.manufacturer_location)),
+            rating: document.evaluate(
+                ratingXpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+            ).snapshotLength,
+        },
+        images: [...new Set(images)],
+        indicative_price: trimmed(document.querySelector(sel.price)),
+    };
+}
+"""
 
-async def _extract_product_title_and_model(page: Page) -> tuple[str | None, str | None]:
-    title_block = await page.query_selector('span[class^="sc-2mcr2-0"]')
+_PRODUCT_SELECTORS = {
+    "title_block": SELECTOR_PRODUCT_TITLE_BLOCK,
+    "tags": SELECTOR_PRODUCT_TAGS,
+    "description": SELECTOR_PRODUCT_DESCRIPTION,
+    "characteristics": SELECTOR_PRODUCT_CHARACTERISTICS,
+    "manufacturer_name": SELECTOR_PRODUCT_MANUFACTURER_NAME,
+    "manufacturer_location": SELECTOR_PRODUCT_MANUFACTURER_LOCATION,
+    "images": SELECTOR_PRODUCT_IMAGES,
+    "price": SELECTOR_PRODUCT_PRICE,
+}
 
-    if not title_block:
-        return "Unknown Product Title", "Unknown Product Model"
 
-    print("[INFO] Found title block")
-    spans = await title_block.query_selector_all("span")
+async def extract_product_data_async(page: Page) -> dict:
+    data = await page.evaluate(
+        _EXTRACT_PRODUCT_JS,
+        {"sel": _PRODUCT_SELECTORS, "ratingXpath": XPATH_PRODUCT_MANUFACTURER_RATING},
+    )
 
-    title, model = "Unknown Product Title", "Unknown Product Model"
+    if data["title"] is None:
+        data["title"] = "Unknown Product Title"
+    if data["model"] is None:
+        data["model"] = "Unknown Product Model"
+    data["description"] = data["description"] or "No description available"
 
-    if len(spans) > 0:
-        title = await spans[0].inner_text()
-    if len(spans) > 1:
-        model = await spans[1].inner_text()
+    price = data["indicative_price"]
+    if price is None:
+        logger.debug("Price element not found on %s", page.url)
+    data["currency"] = "USD" if price and "$" in price else None
 
-    return title, model  # type: ignore
+    return data
 
 
 async def _extract_corresponding_catalog(page: Page):
     pass
 
 
-async def _extract_product_attr_tags(page: Page) -> list[str]:
-    tag_elements = await page.query_selector_all(
-        'div[class^="sc-cw67gy-0"] span[class^="sc-cw67gy-1"]'
-    )
-    return [await el.inner_text() for el in tag_elements]
-
-
-async def _extract_characteristics_table(page: Page) -> dict:
-    characteristics = {}
-    characteristics_table = await page.query_selector("dl.sc-mgb5nu-0.gedvae")
-
-    if characteristics_table:
-        print("[INFO] Found Characterististics table")
-        dt_elements = await characteristics_table.query_selector_all("dt")
-        dd_elements = await characteristics_table.query_selector_all("dd")
-        for dt, dd in zip(dt_elements, dd_elements):
-            key = await dt.inner_text()
-            value = await dd.inner_text()
-            characteristics[key.strip()] = value.strip()
-    return characteristics
-
-
-async def _extract_video_url(page: Page) -> str | None:
-    video_url = None
-    video_header = page.locator('h2:has-text("VIDEO")').first or page.locator(
-        "div.sc-1w8z6ht-5.cBFfGP video"
-    )
-    if await video_header.count():
-        print(f"[INFO] Found video container for: {page.url}")
-
-        video_src = video_header.locator(
-            "xpath=following::video/source"
-        ).first or page.locator("div.sc-1w8z6ht-5.cBFfGP video source")
-
-        if await video_src.count():
-            print(f"[INFO] Found Video element for {page.url}")
-
-            video_url = await video_src.get_attribute("src", timeout=60000)
-    return video_url
-
-
-async def _extract_manufacturer_info(page: Page) -> dict:
-    manu_name = page.locator('div[class*="supplierDetails__Name"]')
-    manu_location = page.locator('div[class*="supplierDetails__Location"]')
-    manufacturer_data = {
-        "name": (await manu_name.inner_text(timeout=60000)).strip()
-        if manu_name
-        else None,
-        "location": (await manu_location.inner_text()).strip()
-        if manu_location
-        else None,
-    }
-    return manufacturer_data
-
-
-async def _extract_manufacturer_rating(page: Page) -> int:
-    man_selector = "xpath=//div[contains(@class, 'supplierDetails__RatingDetails-sc-cmi9pt-12 dVOoeb rating')]//span[contains(@style, 'visibility: hidden')]"
-    man_rating = page.locator(man_selector)
-    return await man_rating.count()
-
-
-async def _extract_product_img_urls(page: Page) -> list:
-    image_urls = []
-    images = await page.query_selector_all(
-        'div[class*="imageViewer__NavPicsWrapper"] img[data-src$=".jpg"]'
-    )
-    if images:
-        print(f"[INFO] Found the product images for: {page.url}")
-        seen = set()
-        for img in images:
-            src = await img.get_attribute("data-src")
-            if src and src not in seen:
-                seen.add(src)
-                image_urls.append(src)
-    return image_urls
-
-
-async def _extract_product_price(
-    page: Page,
-) -> tuple[str | None, Literal["USD"] | None]:
-    """
-    Extracts product price and currency if present.
-    Returns (price, currency) or (None, None).
-    """
-    ""
-    try:
-        price_el = page.locator('div[class*="mainSupplier__PriceValue"] span')
-        # failsafe, incase, there is no price on the page
-        if await price_el.count() > 0:
-            raw_price = await price_el.inner_text()
-            if raw_price:
-                raw_price = raw_price.strip()
-                currency = "USD" if "$" in raw_price else None
-                return raw_price, currency
-        else:
-            print(f"[INFO] Price element not found on {page.url}")
-    except Exception as e:
-        print(f"[WARN] Exception during price extraction: {e}")
-
-    return None, None
-
-
 async def run_playwright():
     product_url: str = (
         # "https://www.medicalexpo.com/prod/tunturi/product-122229-856618.html"
         "https://www.medicalexpo.com/prod/vitrex-medical-s/product-110882-954642.html"  # product link with catalog
     )
-    async with async_playwright() as p:
-        browser = await p.firefox.launch(headless=True)
-        page = await browser.new_page()
-        print(f"[INFO] Attempting to visit: {product_url}")
-        await page.goto(product_url, wait_until="domcontentloaded", timeout=65000)
-        print(f"[INFO] Visit successful: {product_url}")
-        product_data = await extract_product_data_async(page)
-
-        if product_data:
-            print(f"[INFO] Successfully scrapped product: {product_url}")
-            # print(product_data)
-
-
-asyncio.run(run_playwright(), debug=True)
+    await BROWSER_POOL.start(headless=True)
+    try:
+        async with BROWSER_POOL.context() as ctx:
+            page = await ctx.new_page()
+            logger.info("Attempting to visit: %s", product_url)
+            await page.goto(product_url, wait_until="domcontentloaded", timeout=65000)
+            await page.wait_for_selector(
+                SELECTOR_PRODUCT_TITLE_BLOCK, state="attached", timeout=15000
+            )
+            logger.info("Visit successful: %s", product_url)
+            product_data = await extract_product_data_async(page)
+
+            if product_data:
+                logger.info("Successfully scrapped product: %s", product_url)
+                logger.debug("%s", product_data)
+    finally:
+        await BROWSER_POOL.shutdown()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    asyncio.run(run_playwright())
@@ -1,188 +1,234 @@
 import asyncio
+import logging
 from typing import Optional
+from urllib.parse import urldefrag, urljoin
 from warnings import deprecated
 
 from playwright.async_api import (
-    ElementHandle,
     JSHandle,
     Locator,
     Page,
-    async_playwright,
 )
-
-from .utils import extract_product_link_from_tile
-
-
-async def scrape_product_overview_tiles(page: Page) -> list:
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from .constants import (
+    PRODUCT_URL_PATTERN,
+    SELECTOR_PAGINATION_LINKS,
+    SELECTOR_PRODUCT_TILE,
+    SELECTOR_TILE_DESCRIPTION,
+    SELECTOR_TILE_FEATURES,
+    SELECTOR_TILE_IMG,
+    SELECTOR_TILE_LINK_TITLE,
+    SELECTOR_TILE_LOGO_IMG,
+    SELECTOR_TILE_MODEL,
+    SELECTOR_TILE_PRICE,
+    SELECTOR_TILE_SEE_MORE,
+    SELECTOR_TILE_TITLE,
+    SELECTOR_TILE_VIDEO,
+)
+from .utils import BROWSER_POOL, ContextRecycler
+
+logger = logging.getLogger(__name__)
+
+# reads every product tile on the page inside the browser, so a whole listing page
+# costs one round-trip instead of a handful per tile. It also picks up the
+# "see more" tile, whose link leads to the next batch of products
+_EXTRACT_TILES_JS = """
+({ productUrlPattern, sel }) => {
+    const productUrl = new RegExp(productUrlPattern);
+    const text = (node) => (node?.innerText || "").trim();
+
+    const tiles = Array.from(document.querySelectorAll(sel.tile)).map((tile) => {
+        const logo = tile.querySelector(sel.logo);
+        const img = tile.querySelector(sel.img);
+        const price = tile.querySelector(sel.price);
+        const href = tile.querySelector(sel.link)?.parentElement.getAttribute("href");
+
+        return {
+            product_title: text(tile.querySelector(sel.title)) || null,
+            manufacturer_name: logo?.getAttribute("alt") || null,
+            product_model: text(tile.querySelector(sel.model)) || null,
+            price: text(price) || null,
+            currency: price?.dataset.currency || null,
+            manufacturer_img: {
+                img_src: logo?.getAttribute("data-src") || logo?.getAttribute("src") || "",
+                img_alt: logo?.getAttribute("alt") || "",
+            },
+            tile_img: {
+                img_src: img?.getAttribute("src") ?? null,
+                img_alt: img?.getAttribute("alt") ?? null,
+            },
+            tile_description: text(tile.querySelector(sel.description)),
+            has_video: !!tile.querySelector(sel.video),
+            features: Array.from(tile.querySelectorAll(sel.features)).map(text),
+            product_link: href && productUrl.test(href) ? href : null,
+        };
+    });
+
+    const seeMore = document.querySelector(sel.see_more)?.closest("a");
+    return { tiles, see_more: seeMore?.getAttribute("href") || null };
+}
+"""
+
+_TILE_SELECTORS = {
+    "tile": SELECTOR_PRODUCT_TILE,
+    "title": SELECTOR_TILE_TITLE,
+    "link": SELECTOR_TILE_LINK_TITLE,
+    "logo": SELECTOR_TILE_LOGO_IMG,
+    "img": SELECTOR_TILE_IMG,
+    "model": SELECTOR_TILE_MODEL,
+    "price": SELECTOR_TILE_PRICE,
+    "description": SELECTOR_TILE_DESCRIPTION,
+    "video": SELECTOR_TILE_VIDEO,
+    "features": SELECTOR_TILE_FEATURES,
+    "see_more": SELECTOR_TILE_SEE_MORE,
+}
+
+
+async def scrape_product_overview_tiles(page: Page, recycler: ContextRecycler) -> list:
     """
-    Entrypoint function to scrape all product tiles belonging to an index entry
+    Entrypoint function to scrape all product tiles belonging to an index entry.
+    Paginated pages are opened through `recycler`, like every other crawl page
     """
-    result_data = []
-
-    product_tiles = await page.query_selector_all(".product-tile")
-    tiles_count = len(product_tiles)
-
-    if tiles_count:
-        print(f"[INFO] Found {tiles_count} tiles")
+    result_data, see_more_link = await _extract_tiles(page)
+    if result_data:
+        logger.debug("Found %d tiles", len(result_data))
 
-        for tile in product_tiles:
-            tile_data = await scrape_tile_data(tile)
-            if tile_data:
-                result_data.append(tile_data)
-
-    await handle_pagination(page, result_data)
-    print(f"Total tiles scraped: {len(result_data)}")
+    await handle_pagination(page, result_data, recycler, see_more_link=see_more_link)
+    logger.debug("Total tiles scraped: %d", len(result_data))
     return result_data
 
 
-async def scrape_tile_data(tile: ElementHandle) -> Optional[dict]:
+async def _extract_tiles(page: Page) -> tuple[list, Optional[str]]:
     """
-    Responsible for extracting data from a single product tile.
-    It is used for both the first page and paginated pages.
+    Returns the product tiles on the page and the "see more" link, if any.
+    Pages are navigated with `wait_until="commit"`, so this waits for the tiles
+    and then for the rest of the document, the one-shot read below would
+    otherwise miss the tiles (and the pagination under them) still streaming in
     """
-    product_title = await _extract_product_title_from_tile(tile)
-
-    # skip placeholder content
-    if product_title and "{{" in product_title:
-        print("[DEBUG] Placeholder product title discovered... skippng...")
-        return None
-
-    product_data = {
-        "manufacturer_img": await _extract_manufacturer_img(tile),
-        "tile_img": await _extract_tile_img(tile),
-        "tile_description": await _extract_short_form_tile_desc(tile),
-        "has_video": await _has_video_tag(tile),
-        "features": await _extract_product_features(tile),
-        "product_link": await _extract_product_link(tile),
-    }
-    return product_data
-
-
-async def _extract_product_title_from_tile(tile: ElementHandle) -> Optional[str]:
-    title_element = await tile.query_selector("h3.short-name")
-    product_title = (
-        (await title_element.inner_text()).strip() if title_element else None
-    )
-    return product_title
-
-
-async def _extract_short_form_tile_desc(tile: ElementHandle) -> str:
-    description_element = await tile.query_selector("p.description-text")
-    description = (
-        (await description_element.inner_text()).strip() if description_element else ""
-    )
-    return description
-
-
-async def _extract_product_features(tile: ElementHandle) -> list:
-    feature_elements = await tile.query_selector_all(
-        "div.feature-values-container span"
-    )
-    features = (
-        [(await feature.inner_text()).strip() for feature in feature_elements]
-        if feature_elements
-        else []
-    )
-    return features
-
-
-async def _extract_product_link(tile: ElementHandle) -> str:
-    product_link = await extract_product_link_from_tile(tile)
-    if product_link:
-        return product_link
-
-
-async def _extract_tile_img(tile: ElementHandle) -> dict:
-    tile_img_element = await tile.query_selector(".inset-img img")
-    tile_img_src = (
-        await tile_img_element.get_attribute("src") if tile_img_element else None
-    )
-    tile_img_alt = (
-        await tile_img_element.get_attribute("alt") if tile_img_element else None
+    try:
+        await page.wait_for_selector(
+            SELECTOR_PRODUCT_TILE, state="attached", timeout=15000
+        )
+    except PlaywrightTimeoutError:
+        logger.debug("No product tiles found on %s", page.url)
+        return [], None
+    await page.wait_for_load_state("domcontentloaded")
+
+    payload = await page.evaluate(
+        _EXTRACT_TILES_JS,
+        {"productUrlPattern": PRODUCT_URL_PATTERN, "sel": _TILE_SELECTORS},
     )
-    return {"img_src": tile_img_src, "img_alt": tile_img_alt}
-
-
-async def _has_video_tag(tile: ElementHandle) -> bool:
-    video_tag = await tile.query_selector(
-        ".icon-big video"
-    ) or await tile.query_selector(".new-video")
-    return True if video_tag else False
 
+    # skip placeholder content
+    tiles = [
+        tile
+        for tile in payload["tiles"]
+        if not (tile["product_title"] and "{{" in tile["product_title"])
+    ]
+    return tiles, payload["see_more"]
 
-async def _extract_manufacturer_img(tile: ElementHandle) -> dict:
-    manufacturer_img = await tile.query_selector("a.logo img")
-    logo_src = await manufacturer_img.get_attribute("src") if manufacturer_img else ""
-    logo_alt = await manufacturer_img.get_attribute("alt") if manufacturer_img else ""
-    return {"img_src": logo_src, "img_alt": logo_alt}
 
+async def scrape_paginated_data(
+    recycler: ContextRecycler, page_url: str, sem: asyncio.Semaphore
+) -> list:
+    """
+    Visits a paginated page on its own tab and returns its product tiles.
+    It reuses `_extract_tiles` for extracting product tile data.
 
-async def scrape_paginated_data(page_url: str, result_data: list):
+    The tab comes from `recycler`, so it counts towards the context rotation and
+    gets the same asset and tracker blocking as the listing page
     """
-    Visits a paginated page and scrapes the product tiles.
-    It reuses the `scrape_tile_data` function for extracting product tile data.
+    async with sem:
+        page = await recycler.page()
+        try:
+            logger.debug("Visiting paginated page: %s", page_url)
+            await page.goto(page_url, wait_until="commit", timeout=65000)
+
+            logger.debug("Visit successful to paginated page: %s", page_url)
+            tiles, _ = await _extract_tiles(page)
+            return tiles
+        except Exception as e:
+            logger.error("Failed to scrape page %s: %s", page_url, e)
+            return []
+        finally:
+            await recycler.close_page(page)
+
+
+# every listing worker paginates against the same site, so the cap on open tabs
+# is shared by all of them rather than set per listing
+PAGINATION_SEM = asyncio.Semaphore(4)
+
+
+async def handle_pagination(
+    page: Page,
+    result_data: list,
+    recycler: ContextRecycler,
+    see_more_link: Optional[str] = None,
+):
     """
-    try:
-        async with async_playwright() as p:
-            browser = await p.firefox.launch()
-            page = await browser.new_page()
-
-            print(f"[INFO] Visiting paginated page: {page_url}")
-            await page.goto(page_url, wait_until="domcontentloaded", timeout=65000)
+    Handle pagination by visiting all pages and collecting product tile data.
 
-            print(f"[INFO] Visit successful to paginated page: {page_url}")
-            product_tiles = await page.query_selector_all(".product-tile")
+    Every page link is collected up front from the first page and fetched in
+    parallel on pages from `recycler`, instead of following one page to the next.
+    """
+    # links may be relative or carry a fragment, resolve them against the page so
+    # the same page always compares equal
+    start_url = urldefrag(page.url).url
 
-            for tile in product_tiles:
-                tile_data = await scrape_tile_data(tile)
-                if tile_data:
-                    result_data.append(tile_data)
+    def absolute(link: str) -> str:
+        return urldefrag(urljoin(start_url, link)).url
 
-            await browser.close()
-    except Exception as e:
-        print(f"[ERROR] Failed to scrape page {page_url}: {e}")
+    pagination_links = [absolute(link) for link in await get_pagination_links(page)]
 
+    # Skip the first page (already scraped)
+    visited = {start_url, *pagination_links[:1]}
+    candidates = pagination_links[1:]
+    if see_more_link:
+        candidates.append(absolute(see_more_link))
+    hrefs = [link for link in dict.fromkeys(candidates) if link not in visited]
 
-async def handle_pagination(page: Page, result_data: list):
-    """
-    Handle pagination by visiting all pages and collecting product tile data.
-    """
-    pagination_links = await get_pagination_links(page)
-
-    if not pagination_links:
-        print("[INFO] No pagination found.")
+    if not hrefs:
+        logger.debug("No pagination found.")
         return
 
-    # Parallelize scraping across all pages (except the first page)
-    tasks = []
-    for link in pagination_links[1:]:  # Skip the first page (already scraped)
-        tasks.append(scrape_paginated_data(link, result_data))
-
-    await asyncio.gather(*tasks)
+    # a cancelled listing takes its pagination tabs down with it
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            tg.create_task(scrape_paginated_data(recycler, href, PAGINATION_SEM))
+            for href in hrefs
+        ]
+    result_data.extend(tile for task in tasks for tile in task.result())
 
 
 async def get_pagination_links(page: Page) -> list:
-    pagination_elements = await page.query_selector_all("div.pagination-wrapper a")
-    pagination_links = list()
-
-    for elem in pagination_elements:
-        link = await elem.get_attribute("href")
-        if link:
-            pagination_links.append(link)
-
-    return pagination_links
+    return await page.eval_on_selector_all(
+        SELECTOR_PAGINATION_LINKS,
+        "links => links.map((a) => a.getAttribute('href')).filter(Boolean)",
+    )
 
 
 async def run_playwright():
     # index_entry_url: str = "https://www.medicalexpo.com/medical-manufacturer/adjustable-weight-training-bench-29045.html"  # url without pagination
     index_entry_url: str = "https://www.medicalexpo.com/medical-manufacturer/exercise-bike-4969.html"  # url with paginated results
-    async with async_playwright() as p:
-        browser = await p.firefox.launch()
-        page = await browser.new_page()
-        print(f"[INFO] Attempting to visit index: {index_entry_url}")
-        await page.goto(index_entry_url, wait_until="domcontentloaded", timeout=65000)
-        print(f"[INFO] Index visit successful: {index_entry_url}")
-        await scrape_product_overview_tiles(page)
-
-
-asyncio.run(run_playwright(), debug=True)
+    await BROWSER_POOL.start(headless=True)
+    try:
+        async with BROWSER_POOL.context() as ctx:
+            recycler = ContextRecycler(ctx.browser)
+            page = await recycler.page()
+            try:
+                logger.info("Attempting to visit index: %s", index_entry_url)
+                # the tile extraction waits for the tiles themselves
+                await page.goto(index_entry_url, wait_until="commit", timeout=65000)
+                logger.info("Index visit successful: %s", index_entry_url)
+                await scrape_product_overview_tiles(page, recycler)
+            finally:
+                await recycler.close_page(page)
+                await recycler.close()
+    finally:
+        await BROWSER_POOL.shutdown()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    asyncio.run(run_playwright())
@@ -1,206 +1,591 @@
 import asyncio
+import csv
+import logging
+import os
+import queue
 import random
+import re
+import tempfile
+import threading
 from contextlib import asynccontextmanager
-from logging import Logger
+from functools import lru_cache
+from itertools import cycle
 from pathlib import Path
-from typing import Annotated, Any, Callable, Dict, Iterable, List, Optional
+from typing import (IO, Any, Callable, Dict, Iterable, List, Optional,
+                    Sequence, Tuple)
 
-from bs4 import BeautifulSoup
+import orjson
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.worksheet import Worksheet
-from playwright.async_api import ElementHandle, Locator, Page, async_playwright
-from playwright.sync_api import BrowserContext
+from playwright.async_api import (APIRequestContext, Browser, BrowserContext,
+                                  Page, Playwright, Response, Route,
+                                  async_playwright)
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright_stealth import stealth_async
+from selectolax.lexbor import LexborHTMLParser
 
 from .constants import USER_AGENTS as BROWSER_AGENTS
-from .constants import url as BASE_URL
+
+logger = logging.getLogger(__name__)
+
+
+# cookies/consent from a previous run, so the site doesn't re-serve its consent
+# banners and bootstrap scripts on every fresh context
+STORAGE_STATE_PATH = Path(__file__).resolve().parent / "state.json"
+
+# we only ever read text and attribute values (`img[src]` included), never the
+# bytes of these resources
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+
+# analytics and ad beacons, they hold connections open and add nothing we scrape
+BLOCKED_URL_PATTERNS = (
+    "*google-analytics*",
+    "*googletagmanager*",
+    "*doubleclick*",
+    "*facebook.net*",
+    "*hotjar*",
+)
+_BLOCKED_URL_RE = re.compile(
+    "|".join(re.escape(pattern.strip("*")) for pattern in BLOCKED_URL_PATTERNS)
+)
+
+
+async def block_heavy_resources(route: Route) -> None:
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or _BLOCKED_URL_RE.search(
+        request.url
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def block_trackers(page: Page) -> None:
+    """
+    On chromium, drops tracker requests in the network stack via CDP, before they
+    ever reach the `block_heavy_resources` route. Other browsers have no CDP and
+    rely on the route alone
+    """
+    browser = page.context.browser
+    if browser is None or browser.browser_type.name != "chromium":
+        return
+
+    cdp = await page.context.new_cdp_session(page)
+    await cdp.send("Network.enable")
+    await cdp.send("Network.setBlockedURLs", {"urls": list(BLOCKED_URL_PATTERNS)})
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def normalize_whitespace(text: str) -> str:
+    """Collapses every run of whitespace (newlines included) into a single space"""
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+# shuffled once per process, then handed out round-robin so consecutive contexts
+# never repeat an agent
+_USER_AGENT_CYCLE = cycle(random.sample(BROWSER_AGENTS, len(BROWSER_AGENTS)))
 
 
 def get_random_user_agent() -> str:
     # gets a randomized browser agent
-    return random.choice(BROWSER_AGENTS)
+    return next(_USER_AGENT_CYCLE)
+
+
+# the token that gives each engine's agents away. An agent for another engine, or
+# a mobile one (served mobile markup the desktop selectors don't match), would
+# only make a context stand out, so contexts only ever get a desktop agent of the
+# engine they actually run on
+_ENGINE_AGENT_MARKERS = {
+    "chromium": "Chrome/",
+    "firefox": "Firefox/",
+    "webkit": "Version/",
+}
+_MOBILE_AGENT_MARKERS = ("Mobile", "Android", "iPhone", "iPad")
+
+
+def _desktop_agents(engine: str) -> Tuple[str, ...]:
+    marker = _ENGINE_AGENT_MARKERS[engine]
+    return tuple(
+        agent
+        for agent in BROWSER_AGENTS
+        # "(" skips entries that are a placeholder rather than a full agent
+        if marker in agent
+        and "(" in agent
+        and not any(mobile in agent for mobile in _MOBILE_AGENT_MARKERS)
+    )
+
+
+_ENGINE_AGENT_CYCLES = {
+    engine: cycle(random.sample(agents, len(agents)))
+    for engine in _ENGINE_AGENT_MARKERS
+    if (agents := _desktop_agents(engine))
+}
+
+
+def user_agent_for(engine: str) -> Optional[str]:
+    """
+    Next desktop agent for a browser `engine` ("chromium", "firefox", "webkit"),
+    None when we have none, in which case the browser keeps its own
+    """
+    agents = _ENGINE_AGENT_CYCLES.get(engine)
+    return next(agents) if agents else None
 
 
 async def human_delay(min_=0.8, max_=2.5) -> None:
     await asyncio.sleep(random.uniform(min_, max_))
 
 
-async def retry_with_backoff(coro: Callable, retries=3, delay=2):
+class ServerErrorResponse(PlaywrightError):
+    """
+    A navigation the server answered with a 5xx. Playwright only raises for
+    navigations that fail, a 5xx page is one that succeeded, see `goto_checked`
+    """
+
+    def __init__(self, url: str, status: int):
+        super().__init__(f"{url} answered with HTTP {status}")
+        self.url = url
+        self.status = status
+
+
+async def goto_checked(page: Page, url: str, **kwargs) -> Optional[Response]:
+    """`page.goto` that raises `ServerErrorResponse` when the server answers a 5xx"""
+    response = await page.goto(url, **kwargs)
+    if response is not None and response.status >= 500:
+        raise ServerErrorResponse(url, response.status)
+    return response
+
+
+# the network failure codes of chromium (net::ERR_*) and firefox (NS_ERROR_*),
+# which point at a flaky network rather than a bug in our selectors or logic.
+# Only the head of the message is matched, the rest carries the url and the call
+# log, whose text says nothing about why the call failed
+_NETWORK_ERROR_RE = re.compile(r"^(?:[\w.]+: )?(?:net::ERR_|NS_ERROR_)")
+
+
+def _is_transient(error: PlaywrightError) -> bool:
+    if isinstance(error, (PlaywrightTimeoutError, ServerErrorResponse)):
+        return True
+    return _NETWORK_ERROR_RE.match(error.message) is not None
+
+
+def _backoff_delay(attempt: int, base: float, cap: float) -> float:
+    # most failures are blips, so the first retry goes out right away. Later ones
+    # back off exponentially with jitter (so parallel jobs don't retry in
+    # lockstep), capped so a retry never idles for long
+    if attempt == 0:
+        return 0
+    return min(cap, random.uniform(base, base * 3 * 2**attempt))
+
+
+async def retry_with_backoff(coro: Callable, retries=3, delay=0.5, cap=5.0):
     # extends the "core" concept of retry but with exponential backoff
-    # and usable with any functtion
+    # and usable with any functtion.
+    # Only timeouts, network failures and 5xx answers (through `goto_checked`) are
+    # retried, anything else would fail the same way again so it is raised right away
     for i in range(retries):
         try:
             return await coro()
-        except Exception:
-            await asyncio.sleep(delay * 2**i)
-    raise RuntimeError("All retries failed")
+        except PlaywrightError as e:
+            if not _is_transient(e) or i == retries - 1:
+                raise
+            await asyncio.sleep(_backoff_delay(i, delay, cap))
 
 
-async def goto_with_retry(
-    page: Page, target_url: str, retries: int = 3, delay: int = 2
-):
-    # direct implement of page.goto but with a retry logic
-    for i in range(retries):
-        try:
-            await page.goto(target_url, wait_until="domcontentloaded", timeout=10000)
-            return
-        except Exception as e:
-            print(f"[WARN] Failed loading {BASE_URL}, retry {i + 1}/{retries}: {e}")
-            await asyncio.sleep(delay * (2**i))
-
-
-async def fallback_locator(
-    page: Page,
-    selectors: List[str],
-    *,
-    scope: Optional[Locator] = None,
-    logger_func: Optional[Callable[[str], None]] = None,
-    fallback_attrs: Optional[List[Dict[str, str]]] = None,
-) -> Locator:
+async def save_storage_state(
+    ctx: BrowserContext, path: Path = STORAGE_STATE_PATH
+) -> None:
     """
-    Try multiple selectors in order until one matches at least one element.
-    Returns the first matching Locator.
-    Raises ValueError if none match.
+    Saves `ctx`'s cookies and storage to `path` for later runs to start from.
+
+    Concurrent jobs (and every new context, see `_context_options`) read the same
+    file, so it is written to a temp file next to it and swapped in with one
+    `os.replace`; a reader sees the old state or the new one, never half of it
     """
-    base = scope or page
+    state = await ctx.storage_state()
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(orjson.dumps(state))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
-    for selector in selectors:
+
+def _context_options(browser: Browser, **context_opts) -> Dict[str, Any]:
+    """
+    Default `new_context` options for `browser`, with the saved session reused
+    when we have one.
+
+    Every context gets one user agent, picked here and kept for all of its pages,
+    so the server sees one client per context and keeps reusing its connections.
+    It is always a desktop agent of `browser`'s own engine (see `user_agent_for`).
+    Pooled and recycled contexts both come through here
+    """
+    opts: Dict[str, Any] = {
+        "ignore_https_errors": True,
+        "java_script_enabled": True,
+        "bypass_csp": True,
+    }
+    user_agent = user_agent_for(browser.browser_type.name)
+    if user_agent:
+        opts["user_agent"] = user_agent
+    opts.update(context_opts)
+    if "storage_state" not in opts and STORAGE_STATE_PATH.exists():
+        opts["storage_state"] = str(STORAGE_STATE_PATH)
+    return opts
+
+
+# chromium spends CPU and memory on the gpu process, extensions, audio and
+# translate, none of which a scraper uses. Some captchas notice these, so debug
+# runs launch without them
+CHROMIUM_ARGS = (
+    "--no-sandbox",
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-translate",
+    "--mute-audio",
+    "--disable-background-timer-throttling",
+    "--disable-features=IsolateOrigins,site-per-process",
+    "--disable-blink-features=AutomationControlled",
+)
+
+
+class BrowserPool:
+    """
+    Keeps a fixed number of launched browsers warm for the lifetime of the process
+    and hands out a fresh `BrowserContext` per job.
+
+    Launching a browser is the most expensive thing we do, so we pay for it once
+    at startup instead of on every `scrape_url` call.
+
+    When `CDP_ENDPOINT` is set (e.g `http://localhost:9222`), we instead attach to that
+    long-lived chromium over CDP and every job gets its own isolated context on the
+    one shared browser.
+
+    Pooled browsers are firefox unless `BROWSER_TYPE` says otherwise (e.g
+    `chromium`), chromium is launched with `CHROMIUM_ARGS` when `lean` is set.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        cdp_endpoint: Optional[str] = None,
+        browser_type: Optional[str] = None,
+    ):
+        self.size = size
+        self.cdp_endpoint = cdp_endpoint or os.getenv("CDP_ENDPOINT")
+        self.browser_type = browser_type or os.getenv("BROWSER_TYPE", "firefox")
+        self._playwright: Optional[Playwright] = None
+        self._browsers: List[Browser] = []
+        self._shared: Optional[Browser] = None
+        self._available: asyncio.Queue[Browser] = asyncio.Queue()
+        self._lock = asyncio.Lock()
+
+    async def start(
+        self, headless: bool = True, slow_mo: int = 0, lean: bool = True
+    ) -> "BrowserPool":
+        async with self._lock:
+            if self._playwright is not None:
+                return self
+
+            self._playwright = await async_playwright().start()
+
+            if self.cdp_endpoint:
+                self._shared = await self._playwright.chromium.connect_over_cdp(
+                    self.cdp_endpoint, slow_mo=slow_mo
+                )
+                self._browsers.append(self._shared)
+                return self
+
+            launch_opts: Dict[str, Any] = {"headless": headless, "slow_mo": slow_mo}
+            if self.browser_type == "chromium" and lean:
+                launch_opts["args"] = list(CHROMIUM_ARGS)
+
+            launcher = getattr(self._playwright, self.browser_type)
+            for _ in range(self.size):
+                browser = await launcher.launch(**launch_opts)
+                self._browsers.append(browser)
+                self._available.put_nowait(browser)
+        return self
+
+    async def acquire(self, **context_opts) -> BrowserContext:
+        """Waits for an idle browser and opens a new context on it"""
+        # a CDP browser is shared by every concurrent job, contexts keep them isolated
+        if self._shared is not None:
+            return await self._shared.new_context(
+                **_context_options(self._shared, **context_opts)
+            )
+
+        browser = await self._available.get()
         try:
-            loc = base.locator(selector)
-            if await loc.count() > 0:
-                if logger_func:
-                    logger_func(f"[→] Using selector: {selector}")
-                return loc
+            return await browser.new_context(
+                **_context_options(browser, **context_opts)
+            )
         except Exception:
-            continue
-
-    # fallback to using attribute value for matching
-    if fallback_attrs:
-        for attr in fallback_attrs:
-            tag_ = attr.get("tag", "*")
-            key_ = attr.get("attr")
-            value_ = attr.get("value")
-
-            if key_ and value_:
-                # build the expression
-                expr = f"{tag_}[{key_}='{value_}']"
-
-                try:
-                    locator = base.locator(expr)
-                    if await locator.count() > 0:
-                        return locator
-                except Exception:
-                    # skip
-                    continue
-
-    raise ValueError(f"No selectors matched any elements: {selectors}")
-
-
-@asynccontextmanager
-async def browser_context(
-    headless: bool = False,
-    remote_debugging: bool = False,
-    slow_mo: int = 50,
-    user_agent: Optional[str] = None,
-    viewport: Optional[dict] = None,
-    bypass_csp: bool = False,
-):
-    async with async_playwright() as p:
-        _args = [
-            "--no-sandbox",
-            "--disable-setuid-sandbox",
-            "--disable-dev-shm-usage",
-            "--disable-accelerated-2d-canvas",
-            "--no-first-run",
-            "--no-zygote",
-            "--disable-gpu",
-            "--disable-features=IsolateOrigins,site-per-process",
-            "--window-size=1280,800",
-            "--start-maximized",
-        ]
-
-        # browser = await p.chromium.launch(headless=headless, slow_mo=slow_mo, args=_args)
-        browser = await p.firefox.launch(headless=headless, slow_mo=slow_mo)
-        ctx = await browser.new_context(
-            # user_agent=user_agent,
-            # viewport=viewport or {"width": 1280, "height": 800},
-            ignore_https_errors=True,
-            java_script_enabled=True,
-            bypass_csp=True,
-        )
+            self._available.put_nowait(browser)
+            raise
+
+    async def release(self, ctx: BrowserContext) -> None:
+        """Closes the job's context and puts its browser back in the pool"""
+        browser = ctx.browser
+        try:
+            await ctx.close()
+        finally:
+            if browser is not None and browser is not self._shared:
+                self._available.put_nowait(browser)
+
+    @asynccontextmanager
+    async def context(self, **context_opts):
+        ctx = await self.acquire(**context_opts)
         try:
             yield ctx
         finally:
-            await browser.close()
+            await self.release(ctx)
+
+    async def shutdown(self) -> None:
+        """Closes every pooled browser and stops the playwright driver"""
+        async with self._lock:
+            # for a CDP browser this only disconnects, the remote chromium keeps running
+            for browser in self._browsers:
+                await browser.close()
+            self._browsers.clear()
+            self._shared = None
+            self._available = asyncio.Queue()
+
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+
+BROWSER_POOL = BrowserPool()
 
 
-async def _get_rendered_html(page: Page, selector: str | None = None) -> BeautifulSoup:
+class ContextRecycler:
+    """
+    Hands out pages from a `BrowserContext` that is swapped for a fresh one every
+    `every` uses, a use being a page handed out by `page` or a job run again on an
+    existing page through `reuse`.
+
+    A single context kept alive across hundreds of navigations keeps growing in memory,
+    recycling it keeps a long crawl at a steady footprint. A retired context is only
+    closed once the last page handed out from it is closed through `close_page`, so
+    jobs still running on it are not cut off.
+    """
+
+    def __init__(
+        self,
+        browser: Browser,
+        every: int = 50,
+        block_assets: bool = True,
+        **context_opts,
+    ):
+        self.browser = browser
+        self.every = every
+        self.block_assets = block_assets
+        self.context_opts = context_opts
+        self.ctx: Optional[BrowserContext] = None
+        self._uses = 0
+        self._open_pages: Dict[BrowserContext, int] = {}
+        self._lock = asyncio.Lock()
+
+    async def page(self) -> Page:
+        async with self._lock:
+            if self.ctx is None or self._uses >= self.every:
+                await self._rotate()
+
+            self._uses += 1
+            ctx = self.ctx
+            self._open_pages[ctx] += 1
+
+        # the page is counted before it exists, so a failure (or a cancel) while
+        # it is set up has to give the count back, a retired context would
+        # otherwise wait forever for a page that never comes back
+        try:
+            page = await ctx.new_page()
+        except BaseException:
+            await self._release(ctx)
+            raise
+        try:
+            await stealth_async(page)
+            if self.block_assets:
+                await block_trackers(page)
+        except BaseException:
+            await self.close_page(page)
+            raise
+        return page
+
+    async def request_context(self) -> APIRequestContext:
+        """The current context's HTTP client, sharing its cookies and storage state"""
+        async with self._lock:
+            if self.ctx is None:
+                await self._rotate()
+            return self.ctx.request
+
+    async def reuse(self, page: Page) -> Page:
+        """
+        Counts another job on an already open page. Hands the same page back, or a
+        new one on a fresh context once the page's context is due for recycling
+        """
+        async with self._lock:
+            if page.context is self.ctx and self._uses < self.every:
+                self._uses += 1
+                return page
+
+        await self.close_page(page)
+        return await self.page()
+
+    async def close_page(self, page: Page) -> None:
+        ctx = page.context
+        try:
+            await page.close()
+        finally:
+            await self._release(ctx)
+
+    async def _release(self, ctx: BrowserContext) -> None:
+        """Gives back a page's slot, closing its context once retired and unused"""
+        open_pages = self._open_pages.get(ctx)
+        if open_pages is None:
+            return  # `close()` already closed it with the page still out
+        self._open_pages[ctx] = open_pages - 1
+        if ctx is not self.ctx and open_pages == 1:
+            await self._close_context(ctx)
+
+    async def close(self) -> None:
+        """Closes the current context and any retired ones still around"""
+        for ctx in list(self._open_pages):
+            await self._close_context(ctx)
+        self.ctx = None
+
+    async def _rotate(self) -> None:
+        retired = self.ctx
+        self.ctx = await self.browser.new_context(
+            **_context_options(self.browser, **self.context_opts)
+        )
+        self._open_pages[self.ctx] = 0
+        self._uses = 0
+        if self.block_assets:
+            await self.ctx.route("**/*", block_heavy_resources)
+        if retired is not None and not self._open_pages[retired]:
+            await self._close_context(retired)
+
+    async def _close_context(self, ctx: BrowserContext) -> None:
+        self._open_pages.pop(ctx, None)
+        await ctx.close()
+
+
+async def _get_rendered_html(
+    page: Page, selector: str | None = None
+) -> LexborHTMLParser:
+    # selectolax's lexbor backend parses an order of magnitude faster than bs4's
+    # html.parser (and faster than its older modest backend), query the result
+    # with `.css()`/`.css_first()`. The subtree's markup is read in the same call
+    # that looks it up, no element handle is round-tripped first
     if selector:
-        content = await page.query_selector(selector)
-        if content:
-            html = await content.inner_html()
-            return BeautifulSoup(html, "html.parser")
-        print(f"[ERROR] Selector {selector} did not return content.")
+        html = await page.evaluate(
+            "(sel) => document.querySelector(sel)?.innerHTML ?? null", selector
+        )
+        if html is not None:
+            return LexborHTMLParser(html)
+        logger.error("Selector %s did not return content.", selector)
     html = await page.content()
-    return BeautifulSoup(html, "html.parser")
+    return LexborHTMLParser(html)
 
 
+# characters excel refuses in a sheet name, all dropped in one `str.translate` pass
+_INVALID_SHEET_CHARS = str.maketrans("", "", "/\\*[]:?")
+
+
+@lru_cache(maxsize=4096)
 def sanitize_sheet_name(name: str) -> str:
     """Ensure Excel sheet names are valid (max 31 chars, no special chars)."""
-    invalid_chars = ["/", "\\", "*", "[", "]", ":", "?"]
-    for char in invalid_chars:
-        name = name.replace(char, "")
-    return name[:31]
+    return name.translate(_INVALID_SHEET_CHARS)[:31]
 
 
 def auto_adjust_column_width(sheet: Worksheet):
-    # auto-adjust column widths
-    for col in sheet.columns:
-        max_length = max(len(str(cell.value or "")) for cell in col)
-        adjusted_width = max_length + 2
-        col_letter = get_column_letter(col[0].column)
-        sheet.column_dimensions[col_letter].width = adjusted_width
+    # auto-adjust column widths, in one row-major pass over plain values rather
+    # than rebuilding every column out of Cell objects through `sheet.columns`
+    widths: Dict[int, int] = {}
+    for row in sheet.iter_rows(values_only=True):
+        for idx, value in enumerate(row, 1):
+            widths[idx] = max(widths.get(idx, 0), len(str(value or "")))
+
+    for idx, width in widths.items():
+        sheet.column_dimensions[get_column_letter(idx)].width = width + 2
+
+
+def _column_widths(headers: Sequence[str], rows: List[list]) -> List[int]:
+    widths = [len(str(h or "")) for h in headers]
+    for row in rows:
+        for idx, value in enumerate(row):
+            widths[idx] = max(widths[idx], len(str(value or "")))
+    return [w + 2 for w in widths]
+
+
+def _write_sheet(wb: Workbook, title: str, headers: Sequence[str], rows: List[list]):
+    """
+    Streams a sheet into a write-only workbook.
+
+    Write-only sheets can't be read back, so column widths are computed from the
+    rows up front and set before the first append.
+    """
+    ws = wb.create_sheet(title=title)
+    for idx, width in enumerate(_column_widths(headers, rows), 1):
+        ws.column_dimensions[get_column_letter(idx)].width = width
+
+    ws.append(headers)
+    for row in rows:
+        ws.append(row)
+
+
+# sheet headers are built once, not as a fresh list for every sheet
+_OVERVIEW_HEADERS = ("Category", "Subcategory", "URL")
+_SUBCATEGORY_HEADERS = ("Section", "Title", "URL", "Image Src", "Image Alt")
+_NO_IMAGE: Dict[str, str] = {}
 
 
 def write_subcategory_sheets(wb: Workbook, categories: List[Dict[str, Any]]):
     for category in categories:
-        section = category["section"]
         for sub in category["subcategories"]:
-            name = sanitize_sheet_name(sub["name"])
-            index_entries = sub.get("index_entries", [])
-            if not index_entries:
-                continue
-
-            ws = wb.create_sheet(title=name)
-            headers = ["Section", "Title", "URL", "Image Src", "Image Alt"]
-            ws.append(headers)
-
-            for item in index_entries:
-                ws.append(
-                    [
-                        section,
-                        item.get("title", ""),
-                        item.get("href", ""),
-                        item.get("image_meta", {}).get("src", ""),
-                        item.get("image_meta", {}).get("alt", ""),
-                    ]
-                )
+            write_subcategory_sheet(wb, category["section"], sub)
 
-            auto_adjust_column_width(ws)
 
+def write_subcategory_sheet(wb: Workbook, section: str, sub: Dict[str, Any]):
+    index_entries = sub.get("index_entries", [])
+    if not index_entries:
+        return
 
-def write_overview_sheet(wb: Workbook, categories: List[Dict[str, Any]]):
-    overview = wb.active
-    overview.title = "CATEGORIES CATALOG"
-    headers = ["Category", "Subcategory", "URL"]
-    overview.append(headers)
+    rows = [_subcategory_row(section, item) for item in index_entries]
+    _write_sheet(wb, sanitize_sheet_name(sub["name"]), _SUBCATEGORY_HEADERS, rows)
 
-    for category in categories:
-        category_name = category["section"]
-        for sub in category["subcategories"]:
-            overview.append([category_name, sub["name"], sub["url"]])
 
-    auto_adjust_column_width(overview)
+def _subcategory_row(section: str, item: Dict[str, Any]) -> list:
+    # image_meta is looked up once for both columns, a missing one (or a None)
+    # falls back to a shared empty dict
+    image = item.get("image_meta") or _NO_IMAGE
+    return [
+        section,
+        item.get("title", ""),
+        item.get("href", ""),
+        image.get("src", ""),
+        image.get("alt", ""),
+    ]
+
+
+def write_overview_sheet(wb: Workbook, categories: List[Dict[str, Any]]):
+    rows = [
+        [category["section"], sub["name"], sub["url"]]
+        for category in categories
+        for sub in category["subcategories"]
+    ]
+    _write_sheet(wb, "CATEGORIES CATALOG", _OVERVIEW_HEADERS, rows)
 
 
 def write_category_to_excel(
@@ -215,13 +600,50 @@ def write_category_to_excel(
 
     output_path = output_dir / filename
 
-    wb = Workbook()
+    # write-only workbooks stream rows to disk instead of holding a Cell object
+    # for every value in memory
+    wb = Workbook(write_only=True)
     write_overview_sheet(wb, categories)
     write_subcategory_sheets(wb, categories)
     write_products_to_excel(wb, categories)
 
     wb.save(output_path)
-    print(f"[✓] Excel file saved to: {output_path}")
+    logger.info("Excel file saved to: %s", output_path)
+
+
+PRODUCT_EXPORT_HEADERS = (
+    "Section",
+    "Subcategory",
+    "Entry Title",
+    "Product Name",
+    "Manufacturer",
+    "Price",
+    "Currency",
+    "Model",
+    "Features",
+    "Image Src",
+    "Link",
+)
+
+
+def _product_row(
+    section: str, subcategory: str, entry_title: str, p: Dict[str, Any]
+) -> list:
+    # the listing tile's image, as `_EXTRACT_TILES_JS` stores it
+    tile_img = p.get("tile_img") or _NO_IMAGE
+    return [
+        section,
+        subcategory,
+        entry_title,
+        p.get("product_title"),
+        p.get("manufacturer_name"),
+        p.get("price"),
+        p.get("currency"),
+        p.get("product_model"),
+        ", ".join(p.get("features") or ()),
+        tile_img.get("img_src"),
+        p.get("product_link"),
+    ]
 
 
 def write_products_to_excel(
@@ -232,46 +654,108 @@ def write_products_to_excel(
         section = category["section"]
         for sub in category.get("subcategories", []):
             for entry in sub.get("index_entries", []):
-                products = entry.get("products", [])
-
-                if not products:
-                    continue  # skip
-
-                sheet_name = sanitize_sheet_name(entry["title"])
-                ws = wb.create_sheet(title=sheet_name)
-
-                headers = [
-                    "Section",
-                    "Subcategory",
-                    "Entry Title",
-                    "Product Name",
-                    "Manufacturer",
-                    "Price",
-                    "Currency",
-                    "Model",
-                    "Features",
-                    "Image Src",
-                    "Link",
-                ]
-                ws.append(headers)
-
-                for p in products:
-                    ws.append(
-                        [
-                            section,
-                            sub["name"],
-                            entry["title"],
-                            p.get("product_title"),
-                            p.get("manufacturer_name"),
-                            p.get("price"),
-                            p.get("currency"),
-                            p.get("product_model"),
-                            ", ".join(p.get("features", [])),
-                            p.get("tile_image_src"),
-                            p.get("product_link"),
-                        ]
-                    )
-                auto_adjust_column_width(ws)
+                write_product_entry_sheet(wb, section, sub["name"], entry)
+
+
+def write_product_entry_sheet(
+    wb: Workbook, section: str, subcategory: str, entry: Dict[str, Any]
+) -> None:
+    products = entry.get("products", [])
+    if not products:
+        return  # skip
+
+    rows = [_product_row(section, subcategory, entry["title"], p) for p in products]
+    _write_sheet(
+        wb, sanitize_sheet_name(entry["title"]), PRODUCT_EXPORT_HEADERS, rows
+    )
+
+
+class ExcelSink:
+    """
+    Builds a write-only workbook on a background thread, sheet by sheet, while
+    the crawl is still running.
+
+    `submit(write_fn, *args)` queues a `write_fn(wb, *args)` call, e.g.
+    `write_product_entry_sheet` for an entry whose products just came in, and
+    `close()` waits for the queue to drain and saves the file. The arguments are
+    read on the writer thread, so they must not change once submitted.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._queue: queue.Queue = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, write_fn: Callable[..., None], *args: Any) -> None:
+        self._queue.put((write_fn, args))
+
+    def close(self) -> None:
+        """Blocks until the workbook is saved, run it through `asyncio.to_thread`"""
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        logger.info("Excel file saved to: %s", self.path)
+
+    def _run(self) -> None:
+        wb = Workbook(write_only=True)
+        while (job := self._queue.get()) is not None:
+            if self._error is not None:
+                continue  # keep draining so close() doesn't hang
+            write_fn, args = job
+            try:
+                write_fn(wb, *args)
+            except Exception as e:
+                self._error = e
+
+        if self._error is None:
+            try:
+                wb.save(self.path)
+            except Exception as e:
+                self._error = e
+
+
+def write_jsonl_record(out: IO[bytes], record: Dict[str, Any]) -> None:
+    """Appends a single record to a line-delimited JSON file, flushing it right away"""
+    out.write(orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS) + b"\n")
+    out.flush()
+
+
+def write_products_to_csv(
+    out: IO[str], section: str, subcategory: str, entry: Dict[str, Any]
+) -> None:
+    """
+    Appends an index entry's products to an open CSV file, one row per product
+    in `PRODUCT_EXPORT_HEADERS` order, flushing it right away
+    """
+    csv.writer(out).writerows(
+        _product_row(section, subcategory, entry["title"], p)
+        for p in entry.get("products", [])
+    )
+    out.flush()
+
+
+def write_categories_to_json(
+    categories: List[Dict[str, Any]],
+    filename: str = "scraped_expo_data.json",
+    output_dir: Path | None = None,
+):
+    if output_dir is None:
+        output_dir = Path(__file__).resolve().parent / "exports"
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    output_path = output_dir / filename
+
+    # orjson serializes straight to bytes in C, several times faster than `json.dumps`
+    output_path.write_bytes(
+        orjson.dumps(categories, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    )
+    logger.info("JSON file saved to: %s", output_path)
+
+
+_ENTRY_PRODUCT_HEADERS = PRODUCT_EXPORT_HEADERS[3:]
 
 
 def write_product_entry_to_excel(
@@ -285,75 +769,16 @@ def write_product_entry_to_excel(
     filename = f"{section}__{subcategory}__{title}.xlsx".replace(" ", "_")
     path = output_dir / filename
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Products"
-
-    headers = [
-        "Product Name",
-        "Manufacturer",
-        "Price",
-        "Currency",
-        "Model",
-        "Features",
-        "Image Src",
-        "Link",
+    # same columns as the combined export, minus the section/subcategory/entry
+    # ones that the filename already carries
+    rows = [
+        _product_row(section, subcategory, entry["title"], p)[3:]
+        for p in entry["products"]
     ]
-    ws.append(headers)
-
-    for p in entry["products"]:
-        ws.append(
-            [
-                p.get("product_title"),
-                p.get("manufacturer_name"),
-                p.get("price"),
-                p.get("currency"),
-                p.get("product_model"),
-                ", ".join(p.get("features", [])),
-                p.get("tile_image_src"),
-                p.get("product_link"),
-            ]
-        )
-
-    auto_adjust_column_width(ws)
+    wb = Workbook(write_only=True)
+    _write_sheet(wb, "Products", _ENTRY_PRODUCT_HEADERS, rows)
     wb.save(path)
-    print(f"[✓] Saved: {path}")
-
-
-async def extract_product_link_from_tile(tile: ElementHandle) -> str | None:
-    """
-    Extracts the actual product link from a product tile.
-    Targets the <a> that wraps an <h3 class="short-name">.
-    """
-    import re
-
-    try:
-        # grabs the <h3> element that indicates a product link
-        h3_el = await tile.query_selector("a[href] > h3.short-name")
-        if h3_el:
-            # walk back to the parent <a>
-            parent_a = await h3_el.evaluate_handle("node => node.parentElement")
-            if parent_a:
-                href = await parent_a.get_attribute("href")
-                if href and re.match(
-                    r"^https://www\.medicalexpo\.com/prod/.+/product-\d+-\d+\.html$",
-                    href,
-                ):
-                    return href
-    except Exception as e:
-        print(f"[ERROR] Could not extract product link: {e}")
-
-    return None
-
-
-async def safe_inner_text(locator: Locator) -> str | None:
-    """Utility fn to help us safely access the inner text of a locator element without breaking the script"""
-    try:
-        if await locator.count() > 0:
-            return (await locator.inner_text()).strip()
-    except Exception:
-        pass
-    return None
+    logger.info("Saved: %s", path)
 
 
 async def is_valid_product_page(
@@ -408,7 +833,7 @@ def process_parallel(
 
     # use all available cpu cores
     with mp.Pool(processes=num_workers) as pool:
-        for result_chunk in pool.imap(process_function, chunk_workload(dataset, chunk_size))
+        for result_chunk in pool.imap(process_function, chunk_workload(dataset, chunk_size)):
             handle_processed_result(result_chunk)
 
 
@@ -0,0 +1,55 @@
+import asyncio
+
+from src.scrapper import async_scrapper
+
+INDEX_HTML = """
+<h1 id="category">Exercise bikes</h1>
+<div id="category-group">
+  <ul class="category-grouplist">
+    <li><a href="/medical-manufacturer/upright-bike-1.html">Upright bikes</a></li>
+    <li><a>Recumbent bikes</a></li>
+    <li><a href="">Spin bikes</a></li>
+  </ul>
+</div>
+"""
+
+
+def test_parse_index_entries_skips_anchors_without_href():
+    entries = async_scrapper._parse_index_entries(INDEX_HTML, "Exercise bikes")
+
+    assert [entry["title"] for entry in entries] == ["Upright bikes"]
+
+
+def test_scrape_product_overview_skips_entries_without_href(monkeypatch):
+    fetched = []
+
+    async def fake_get_or_fetch(url, fetcher):
+        fetched.append(url)
+        return [{"product_title": "Upright bike"}]
+
+    monkeypatch.setattr(async_scrapper, "get_or_fetch", fake_get_or_fetch)
+
+    linked = {
+        "title": "Upright bikes",
+        "href": "https://www.medicalexpo.com/medical-manufacturer/upright-bike-1.html",
+    }
+    unlinked = {"title": "Recumbent bikes", "href": None}
+    categories = [
+        {
+            "section": "Fitness",
+            "subcategories": [
+                {
+                    "name": "Exercise bikes",
+                    "url": "https://www.medicalexpo.com/exercise-bike.html",
+                    "index_entries": [unlinked, linked],
+                }
+            ],
+        }
+    ]
+
+    # the listing fetch is faked, so no recycler (or browser) is ever touched
+    asyncio.run(async_scrapper.scrape_product_overview(None, categories))
+
+    assert fetched == [linked["href"]]
+    assert linked["products"] == [{"product_title": "Upright bike"}]
+    assert "products" not in unlinked
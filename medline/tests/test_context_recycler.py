@@ -0,0 +1,147 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.scrapper import utils
+from src.scrapper.utils import ContextRecycler
+
+
+class FakePage:
+    def __init__(self, context: "FakeContext"):
+        self.context = context
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, fail_new_page: bool = False):
+        self.fail_new_page = fail_new_page
+        self.closed = False
+        self.request = object()
+
+    async def new_page(self) -> FakePage:
+        if self.fail_new_page:
+            raise RuntimeError("new_page failed")
+        return FakePage(self)
+
+    async def route(self, *args) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeBrowser:
+    browser_type = SimpleNamespace(name="firefox")
+
+    def __init__(self, *contexts: FakeContext):
+        self.contexts = list(contexts)
+        self.opened = []
+
+    async def new_context(self, **opts) -> FakeContext:
+        ctx = self.contexts.pop(0) if self.contexts else FakeContext()
+        self.opened.append(ctx)
+        return ctx
+
+
+@pytest.fixture(autouse=True)
+def no_page_setup(monkeypatch):
+    async def noop(page):
+        pass
+
+    monkeypatch.setattr(utils, "stealth_async", noop)
+    monkeypatch.setattr(utils, "block_trackers", noop)
+
+
+def test_context_is_swapped_after_every_uses():
+    browser = FakeBrowser()
+    recycler = ContextRecycler(browser, every=2)
+
+    async def go() -> list:
+        pages = []
+        for _ in range(3):
+            page = await recycler.page()
+            pages.append(page)
+            await recycler.close_page(page)
+        return pages
+
+    pages = asyncio.run(go())
+
+    assert [page.context for page in pages] == [
+        browser.opened[0],
+        browser.opened[0],
+        browser.opened[1],
+    ]
+    assert browser.opened[0].closed
+    assert not browser.opened[1].closed
+
+
+def test_retired_context_waits_for_its_last_page():
+    browser = FakeBrowser()
+    recycler = ContextRecycler(browser, every=1)
+
+    async def go():
+        first = await recycler.page()
+        second = await recycler.page()
+        assert second.context is not first.context
+        assert not first.context.closed
+        await recycler.close_page(first)
+        assert first.context.closed
+
+    asyncio.run(go())
+
+
+def test_failed_new_page_gives_its_slot_back():
+    broken = FakeContext(fail_new_page=True)
+    browser = FakeBrowser(broken)
+    recycler = ContextRecycler(browser, every=1)
+
+    async def go():
+        with pytest.raises(RuntimeError):
+            await recycler.page()
+        # rotating away from it closes it, nothing is left open on it
+        page = await recycler.page()
+        assert page.context is not broken
+
+    asyncio.run(go())
+    assert broken.closed
+
+
+def test_failed_page_setup_closes_the_page(monkeypatch):
+    browser = FakeBrowser()
+    recycler = ContextRecycler(browser, every=1)
+    pages = []
+
+    async def stealth(page):
+        pages.append(page)
+        if len(pages) == 1:
+            raise RuntimeError("stealth failed")
+
+    monkeypatch.setattr(utils, "stealth_async", stealth)
+
+    async def go():
+        with pytest.raises(RuntimeError):
+            await recycler.page()
+        await recycler.page()
+
+    asyncio.run(go())
+    assert pages[0].closed
+    assert browser.opened[0].closed
+
+
+def test_close_page_after_close_is_a_no_op():
+    browser = FakeBrowser()
+    recycler = ContextRecycler(browser)
+
+    async def go():
+        page = await recycler.page()
+        await recycler.close()
+        await recycler.close_page(page)
+        return page
+
+    page = asyncio.run(go())
+    assert page.closed
+    assert page.context.closed
@@ -0,0 +1,34 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.core.config import Settings
+from src.core.db import _async_url, _engine_options
+
+
+def test_memory_sqlite_shares_one_connection():
+    options = _engine_options(Settings(DATABASE_URL="sqlite:///:memory:"))
+
+    assert options["poolclass"] is StaticPool
+
+
+def test_file_sqlite_gives_each_session_its_own_connection(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'medline.db'}"
+    options = _engine_options(Settings(DATABASE_URL=database_url))
+    assert "poolclass" not in options
+
+    async def connections() -> tuple:
+        engine = create_async_engine(_async_url(database_url), **options)
+        try:
+            async with AsyncSession(engine) as first, AsyncSession(engine) as second:
+                raw = [
+                    await (await session.connection()).get_raw_connection()
+                    for session in (first, second)
+                ]
+                return tuple(conn.driver_connection for conn in raw)
+        finally:
+            await engine.dispose()
+
+    first, second = asyncio.run(connections())
+    assert first is not second
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from playwright.async_api import Error as PlaywrightError
+
+from src.scrapper import utils
+from src.scrapper.utils import (ServerErrorResponse, _is_transient,
+                                goto_checked, retry_with_backoff)
+
+
+class FakeResponse:
+    def __init__(self, status: int):
+        self.status = status
+
+
+class FakePage:
+    def __init__(self, *statuses: int):
+        self.statuses = list(statuses)
+        self.visits = 0
+
+    async def goto(self, url: str, **kwargs):
+        self.visits += 1
+        return FakeResponse(self.statuses.pop(0))
+
+
+def test_network_error_codes_are_transient():
+    assert _is_transient(
+        PlaywrightError("Page.goto: net::ERR_CONNECTION_RESET at https://x.com/")
+    )
+    assert _is_transient(PlaywrightError("Page.goto: NS_ERROR_NET_RESET"))
+
+
+def test_status_like_digits_in_the_url_are_not_transient():
+    error = PlaywrightError(
+        "Page.goto: Target page, context or browser has been closed\n"
+        "Call log:\n  - navigating to https://x.com/prod/a/product-503-504.html"
+    )
+    assert not _is_transient(error)
+
+
+def test_goto_checked_raises_on_5xx():
+    with pytest.raises(ServerErrorResponse) as e:
+        asyncio.run(goto_checked(FakePage(503), "https://x.com/"))
+    assert e.value.status == 503
+
+
+def test_5xx_navigation_is_retried(monkeypatch):
+    monkeypatch.setattr(utils, "_backoff_delay", lambda *args: 0)
+    page = FakePage(502, 200)
+
+    response = asyncio.run(
+        retry_with_backoff(lambda: goto_checked(page, "https://x.com/"))
+    )
+
+    assert response.status == 200
+    assert page.visits == 2
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from src.scrapper import scrape_cache
+from src.scrapper.scrape_cache import ScrapeCache
+
+URL = "https://x.com/cat/widgets-1.html"
+
+
+class Fetcher:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def run(cache: ScrapeCache, *calls):
+    async def go() -> list:
+        try:
+            return [await cache.get_or_fetch(url, fetcher) for url, fetcher in calls]
+        finally:
+            await cache.close()
+
+    return asyncio.run(go())
+
+
+def test_hit_skips_the_fetcher_and_returns_a_copy(tmp_path):
+    cache = ScrapeCache(path=tmp_path / "cache.sqlite3")
+    fetch = Fetcher([{"name": "a"}])
+
+    async def go() -> list:
+        try:
+            first = await cache.get_or_fetch(URL, fetch)
+            first[0]["name"] = "changed"
+            return await cache.get_or_fetch(URL + "?utm_source=x#top", fetch)
+        finally:
+            await cache.close()
+
+    assert asyncio.run(go()) == [{"name": "a"}]
+    assert fetch.calls == 1
+
+
+def test_results_outlive_the_instance_until_the_ttl(tmp_path, monkeypatch):
+    path = tmp_path / "cache.sqlite3"
+    now = [1000.0]
+    monkeypatch.setattr(scrape_cache.time, "time", lambda: now[0])
+    fetch = Fetcher(["old"], ["new"])
+
+    run(ScrapeCache(path=path, ttl=60), (URL, fetch))
+    now[0] += 59
+    assert run(ScrapeCache(path=path, ttl=60), (URL, fetch)) == [["old"]]
+    now[0] += 1
+    assert run(ScrapeCache(path=path, ttl=60), (URL, fetch)) == [["new"]]
+    assert fetch.calls == 2
+
+
+def test_empty_results_are_not_cached(tmp_path):
+    fetch = Fetcher([], None, ["tile"])
+
+    results = run(
+        ScrapeCache(path=tmp_path / "cache.sqlite3"),
+        (URL, fetch),
+        (URL, fetch),
+        (URL, fetch),
+        (URL, fetch),
+    )
+
+    assert results == [[], None, ["tile"], ["tile"]]
+    assert fetch.calls == 3
+
+
+def test_failures_are_not_cached(tmp_path):
+    cache = ScrapeCache(path=tmp_path / "cache.sqlite3")
+    fetch = Fetcher(RuntimeError("boom"), ["tile"])
+
+    async def go():
+        try:
+            with pytest.raises(RuntimeError):
+                await cache.get_or_fetch(URL, fetch)
+            return await cache.get_or_fetch(URL, fetch)
+        finally:
+            await cache.close()
+
+    assert asyncio.run(go()) == ["tile"]
+    assert fetch.calls == 2
+
+
+def test_concurrent_calls_for_one_url_fetch_once(tmp_path):
+    cache = ScrapeCache(path=tmp_path / "cache.sqlite3")
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["tile"]
+
+    async def go():
+        try:
+            return await asyncio.gather(
+                *(cache.get_or_fetch(URL, fetch) for _ in range(3))
+            )
+        finally:
+            await cache.close()
+
+    assert asyncio.run(go()) == [["tile"]] * 3
+    assert calls == 1
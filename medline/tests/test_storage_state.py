@@ -0,0 +1,25 @@
+import asyncio
+
+import orjson
+
+from src.scrapper.utils import save_storage_state
+
+
+class FakeContext:
+    def __init__(self, state: dict):
+        self.state = state
+
+    async def storage_state(self) -> dict:
+        return self.state
+
+
+def test_storage_state_replaces_the_file_in_one_step(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_bytes(b'{"cookies": []}')
+    state = {"cookies": [{"name": "consent", "value": "1"}], "origins": []}
+
+    asyncio.run(save_storage_state(FakeContext(state), path))
+
+    assert orjson.loads(path.read_bytes()) == state
+    # the temp file it was written to is gone, swapped in under the real name
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]